@@ -1,8 +1,18 @@
+import click
 from flask import Flask
 from flask_cors import CORS
 from .config import Config
 from .celery_app import make_celery  # Pastikan ini di-import
-from grist_api import GristDocAPI
+from . import catalog_warmer  # Daftarkan task warm_catalog
+from .grist_client import PooledGristDocAPI
+from .grist_cache import CachedGristAPI
+from .grist_sync import GristSyncEngine
+from .grist_store import SnapshotStore
+from .catalog_cache import ResponseCache, add_age_header
+from .compression import compress_response
+from .json_provider import FastJSONProvider
+from .mongo_indexes import ensure_indexes, index_coverage
+from .reservation_slots import backfill_slots
 
 from .controllers.grist.branch import branch_controller
 from .controllers.grist.itemMenu import itemMenu_controller
@@ -11,6 +21,10 @@ from .controllers.grist.itemOption import itemOption_controller
 from .controllers.grist.itemPackage import itemPackage_controller
 from .controllers.grist.option import option_controller
 from .controllers.grist.table import table_controller
+from .controllers.grist.branchMenu import branchMenu_controller
+from .controllers.grist.cache import cache_controller
+from .controllers.grist.webhook import webhook_controller
+from .controllers.grist.writeQueue import writeQueue_controller
 from .controllers.mongodb.customer import customer_controller
 from .controllers.mongodb.reservation import reservation_controller
 from .controllers.mongodb.reservation_dashboard import reservation_dashboard_controller
@@ -18,22 +32,72 @@ from .controllers.mongodb.invoice import invoice_controller
 from .controllers.mongodb.user import user_controller
 from .controllers.mongodb.refund import refund_controller
 from .controllers.mongodb.disbursement import disbursement_controller
+from .controllers.mongodb.availability import availability_controller
 
 
 def reservation_app():
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
     app.config.from_object(Config)
     CORS(app, resources={r"/*": {"origins": "*"}})
 
-    # Inisialisasi API Grist
-    app.api = GristDocAPI(
+    # Inisialisasi API Grist, dibungkus cache supaya tidak fetch tiap request
+    grist_api = PooledGristDocAPI(
         server=app.config['SERVER'],
         doc_id=app.config['DOC_ID'],
         api_key=app.config['API_KEY'],
+        pool_size=app.config['GRIST_POOL_SIZE'],
+        connect_timeout=app.config['GRIST_CONNECT_TIMEOUT'],
+        read_timeout=app.config['GRIST_READ_TIMEOUT'],
+        retries=app.config['GRIST_RETRIES'],
     )
+    app.api = CachedGristAPI(
+        grist_api,
+        default_ttl=app.config['GRIST_CACHE_TTL'],
+        stale_ttl=app.config['GRIST_CACHE_STALE_TTL'],
+        table_ttls=app.config['GRIST_CACHE_TABLE_TTLS'],
+        sync=GristSyncEngine(
+            grist_api,
+            reconcile_interval=app.config['GRIST_SYNC_RECONCILE_INTERVAL'],
+        ),
+        store=SnapshotStore(app.config['GRIST_SNAPSHOT_PATH']) if app.config['GRIST_SNAPSHOT_PATH'] else None,
+        fetch_workers=app.config['GRIST_FETCH_WORKERS'],
+        max_partitions=app.config['GRIST_CACHE_MAX_PARTITIONS'],
+        generation_interval=app.config['GRIST_CACHE_GENERATION_INTERVAL'],
+    )
+    # Snapshot terakhir dari disk, supaya katalog langsung bisa dilayani
+    app.api.load_persisted()
+    app.catalog_cache = ResponseCache()
+    app.after_request(add_age_header)
+    app.after_request(compress_response)
 
     # Database MongoDB
     app.config['db'] = Config().db
+    if app.config['db'] is not None and app.config['MONGO_ENSURE_INDEXES']:
+        ensure_indexes(app.config['db'])
+
+    @app.cli.command("mongo-indexes")
+    @click.option("--check", is_flag=True, help="Hanya laporkan coverage, tanpa membuat index")
+    def mongo_indexes(check):
+        """Buat index MongoDB dan laporkan query yang belum ter-cover index."""
+        db = app.config['db']
+        if db is None:
+            raise click.ClickException("MongoDB tidak tersedia")
+        if not check:
+            for result in ensure_indexes(db):
+                click.echo(f"{result['status']:5} {result['collection']}.{result['index']} {result.get('error', '')}")
+        for query in index_coverage(db):
+            click.echo(f"{query['coverage']:7} {query['collection']} {query['fields']} ({query['usedBy']}) -> {query['index']}")
+
+    @app.cli.command("backfill-slots")
+    @click.option("--batch-size", type=int, default=None, help="Jumlah reservasi per batch")
+    def backfill_slots_command(batch_size):
+        """Isi slotAt (UTC) untuk reservasi lama yang belum punya."""
+        db = app.config['db']
+        if db is None:
+            raise click.ClickException("MongoDB tidak tersedia")
+        processed = backfill_slots(db, batch_size or app.config['SLOT_BACKFILL_BATCH_SIZE'])
+        click.echo(f"{processed} reservasi diproses")
 
     # Inisialisasi Celery
     make_celery(app)
@@ -46,6 +110,10 @@ def reservation_app():
     app.register_blueprint(itemPackage_controller)
     app.register_blueprint(option_controller)
     app.register_blueprint(table_controller)
+    app.register_blueprint(branchMenu_controller)
+    app.register_blueprint(cache_controller)
+    app.register_blueprint(webhook_controller)
+    app.register_blueprint(writeQueue_controller)
 
     app.register_blueprint(customer_controller)
     app.register_blueprint(reservation_controller)
@@ -54,5 +122,6 @@ def reservation_app():
     app.register_blueprint(user_controller)
     app.register_blueprint(refund_controller)
     app.register_blueprint(disbursement_controller)
+    app.register_blueprint(availability_controller)
 
     return app
@@ -0,0 +1,151 @@
+import hashlib
+import threading
+from functools import wraps
+from flask import request, jsonify, current_app, g
+import requests
+from .compression import CACHED_LEVELS, MIN_SIZE, choose_encoding, compress
+
+
+class EncodedResponse:
+    """
+    Body JSON yang sudah di-encode beserta ETag-nya. Versi terkompresi
+    (gzip/br) dibuat saat pertama diminta lalu disimpan di entri yang sama.
+    """
+
+    __slots__ = ("versions", "body", "etag", "compressed")
+
+    def __init__(self, versions, body):
+        self.versions = versions
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.compressed = {}
+
+    def encoded(self, encoding):
+        """(body, etag) untuk encoding yang diminta; None = tanpa kompresi."""
+        if encoding is None or len(self.body) < MIN_SIZE:
+            return self.body, self.etag
+        body = self.compressed.get(encoding)
+        if body is None:
+            body = self.compressed[encoding] = compress(self.body, encoding, CACHED_LEVELS)
+        # ETag beda per representasi supaya cache perantara tidak tertukar
+        return body, f"{self.etag}-{encoding}"
+
+
+class ResponseCache:
+    """
+    Cache body response katalog per path (termasuk query string).
+
+    Entri dianggap valid selama versi snapshot tabel Grist yang dipakai
+    untuk membangunnya belum berubah, jadi tidak perlu TTL sendiri.
+    """
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key, versions):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.versions == versions:
+                self.hits += 1
+                return entry
+            self.misses += 1
+            return None
+
+    def put(self, key, versions, body):
+        entry = EncodedResponse(versions, body)
+        with self._lock:
+            self._entries.pop(key, None)
+            if len(self._entries) >= self.max_entries:
+                # Buang entri paling lama
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = entry
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "compressedBytes": sum(
+                    len(body) for entry in self._entries.values() for body in entry.compressed.values()
+                ),
+                "hits": self.hits,
+                "misses": self.misses,
+                "notModified": self.not_modified,
+            }
+
+    def respond(self, entry):
+        encoding = choose_encoding()
+        body, etag = entry.encoded(encoding)
+        if request.if_none_match.contains(etag):
+            with self._lock:
+                self.not_modified += 1
+            response = current_app.response_class(status=304)
+        else:
+            response = current_app.response_class(body, status=200, mimetype="application/json")
+            if body is not entry.body:
+                response.headers["Content-Encoding"] = encoding
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+
+def snapshot_version(api, spec, snap):
+    if isinstance(spec, str):
+        return snap.table, snap.version
+    return api.view_version(*spec, snap=snap)
+
+
+def catalog_cached(*tables):
+    """
+    Decorator untuk route katalog Grist: simpan body JSON yang sudah di-encode
+    dan layani If-None-Match dengan 304. Hanya response 200 yang di-cache.
+
+    Tiap tabel bisa berupa nama tabel (seluruh tabel) atau tuple
+    (tabel, kolom); untuk tuple, nilai filter diambil dari argumen route
+    dengan nama yang sama dengan kolomnya, sesuai api.view().
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = current_app.catalog_cache
+            api = current_app.api
+            specs = [
+                table if isinstance(table, str) else (table[0], table[1], kwargs[table[1]])
+                for table in tables
+            ]
+            try:
+                # Tabel yang belum ada di cache diambil paralel sebelum cek versi
+                snaps = api.fetch_many(specs)
+                versions = tuple(snapshot_version(api, spec, snap) for spec, snap in zip(specs, snaps))
+            except requests.exceptions.RequestException as e:
+                return jsonify({'errorMessage': str(e)}), 500
+            # Handler memakai snapshot yang sama (api.view/lookup), tanpa resolve ulang
+            g.grist_views = {spec: snap for spec, snap in zip(specs, snaps) if not isinstance(spec, str)}
+
+            key = request.full_path
+            entry = cache.get(key, versions)
+            if entry is None:
+                response = current_app.make_response(func(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                entry = cache.put(key, versions, response.get_data())
+            return cache.respond(entry)
+        return wrapper
+    return decorator
+
+
+def add_age_header(response):
+    """Header Age = umur (detik) snapshot Grist tertua yang dipakai request ini."""
+    age = g.get("grist_age")
+    if age is not None:
+        response.headers["Age"] = str(int(age))
+    return response
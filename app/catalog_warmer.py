@@ -0,0 +1,68 @@
+import time
+from datetime import datetime
+from app.celery_app import celery
+from app.controllers.grist.branchMenu import BRANCH_MENU_TABLES, build_branch_menu
+
+# Semua tabel Grist yang dibaca blueprint katalog
+CATALOG_TABLES = [
+    'BranchCategory', 'Branch', 'BranchQuota',
+    'CategoryItemMenu', 'ItemMenu', 'ItemOption', 'ItemMenuPackage', 'Options',
+    'Tables_Area', 'TablesSection', 'Tables',
+]
+
+
+@celery.task
+def warm_catalog():
+    try:
+        app = celery.app
+        if app is None:
+            print("Flask app is not attached to Celery!")
+            return
+        with app.app_context():
+            api = app.api
+            run = {
+                "startedAt": datetime.utcnow(),
+                "tables": {},
+                "branches": 0,
+                "errors": [],
+            }
+            started = time.time()
+
+            # Segarkan semua tabel; yang berubah otomatis ditulis ke snapshot bersama
+            for table in CATALOG_TABLES:
+                table_started = time.time()
+                try:
+                    snap = api.refresh(table)
+                    run["tables"][table] = {
+                        "rows": len(snap.rows),
+                        "version": snap.version,
+                        "duration": round(time.time() - table_started, 3),
+                    }
+                except Exception as e:
+                    run["errors"].append(f"{table}: {e}")
+
+            # View menu per branch, dipublikasikan ke cache bersama untuk web worker
+            branches = {branch.get('BranchCode') for branch in api.records('Branch')}
+            for BranchCode in sorted(code for code in branches if code):
+                data = build_branch_menu(api, BranchCode)
+                if not (data["categories"] or data["uncategorizedItems"]):
+                    continue
+                body = app.json.response({
+                    "message": "Success get branch menu",
+                    "data": data
+                }).get_data()
+                if api.publish_view(f"branch_menu/{BranchCode}", BRANCH_MENU_TABLES, body):
+                    run["branches"] += 1
+
+            run["duration"] = round(time.time() - started, 3)
+            run["finishedAt"] = datetime.utcnow()
+
+            db = app.config['db']
+            if db is not None:
+                db.catalog_warm_runs.insert_one(dict(run))
+            print(f"Catalog warmed in {run['duration']}s, {run['branches']} branch menus published")
+            run.pop("startedAt")
+            run.pop("finishedAt")
+            return run
+    except Exception as e:
+        print(f"Error in warm_catalog: {e}")
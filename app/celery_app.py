@@ -6,6 +6,16 @@ def make_celery(app):
     celery.conf.update(
         broker_url=app.config['CELERY_BROKER_URL'],
         result_backend=app.config['CELERY_RESULT_BACKEND'],
+        beat_schedule={
+            'warm-catalog': {
+                'task': 'app.catalog_warmer.warm_catalog',
+                'schedule': app.config['CATALOG_WARM_INTERVAL'],
+            },
+            'flush-grist-writes': {
+                'task': 'app.grist_writer.flush_grist_writes',
+                'schedule': app.config['GRIST_WRITE_SWEEP_INTERVAL'],
+            },
+        },
     )
     celery.app = app  # Tambahkan aplikasi Flask ke Celery
     print(f"Celery app linked to Flask app: {celery.app is not None}")  # Tambahkan log debug
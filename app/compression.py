@@ -0,0 +1,64 @@
+import gzip
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # brotli opsional, tanpa itu hanya gzip
+    brotli = None
+
+# Body lebih kecil dari ini tidak sebanding dengan overhead kompresi
+MIN_SIZE = 500
+
+# Response dinamis dikompres per request, jadi pakai level yang cepat.
+# Entri cache katalog hanya dikompres sekali per versi, jadi boleh lebih padat.
+DYNAMIC_LEVELS = {"br": 4, "gzip": 6}
+CACHED_LEVELS = {"br": 9, "gzip": 9}
+
+
+def supported_encodings():
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding():
+    """Encoding terbaik yang diterima client (Accept-Encoding), atau None."""
+    accepted = request.accept_encodings
+    best, best_quality = None, 0
+    for encoding in supported_encodings():
+        quality = accepted[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body, encoding, levels=DYNAMIC_LEVELS):
+    if encoding == "br":
+        return brotli.compress(body, quality=levels["br"])
+    return gzip.compress(body, compresslevel=levels["gzip"], mtime=0)
+
+
+def compress_response(response):
+    """
+    Hook after_request: kompres response JSON sesuai Accept-Encoding.
+    Response yang sudah punya Content-Encoding (mis. dari cache katalog)
+    atau streaming dibiarkan apa adanya.
+    """
+    response.vary.add("Accept-Encoding")
+    if (
+        response.status_code != 200
+        or response.mimetype != "application/json"
+        or response.is_streamed
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    body = response.get_data()
+    if len(body) < MIN_SIZE:
+        return response
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+
+    response.set_data(compress(body, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
@@ -10,11 +10,61 @@ class Config:
     CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
     CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
 
+    # Interval catalog warmer di Celery beat (detik)
+    CATALOG_WARM_INTERVAL = int(os.getenv('CATALOG_WARM_INTERVAL', 20))
+    # Log run warmer (catalog_warm_runs) dihapus MongoDB setelah umur ini (detik, TTL index)
+    CATALOG_WARM_RUNS_TTL = int(os.getenv('CATALOG_WARM_RUNS_TTL', 7 * 24 * 3600))
+
     # Konfigurasi lainnya
     SERVER = os.getenv('SERVER')
     DOC_ID = os.getenv('DOC_ID')
     API_KEY = os.getenv('API_KEY')
     MONGODB_URI = os.getenv('MONGODB_URI')
+    # Buat index MongoDB saat app/worker start (matikan kalau dikelola lewat CLI saja)
+    MONGO_ENSURE_INDEXES = os.getenv('MONGO_ENSURE_INDEXES', 'true').lower() == 'true'
+    # Jumlah dokumen per batch cursor / chunk untuk response NDJSON
+    STREAM_BATCH_SIZE = int(os.getenv('STREAM_BATCH_SIZE', 500))
+    # Zona waktu date/time reservasi (slotAt disimpan dalam UTC) dan ukuran batch backfill slotAt
+    RESERVATION_TIMEZONE = os.getenv('RESERVATION_TIMEZONE', 'Asia/Jakarta')
+    SLOT_BACKFILL_BATCH_SIZE = int(os.getenv('SLOT_BACKFILL_BATCH_SIZE', 1000))
+
+    # Koneksi HTTP ke Grist: ukuran pool per proses (>= jumlah thread worker), timeout (detik), retry
+    GRIST_POOL_SIZE = int(os.getenv('GRIST_POOL_SIZE', 10))
+    GRIST_CONNECT_TIMEOUT = float(os.getenv('GRIST_CONNECT_TIMEOUT', 3.05))
+    GRIST_READ_TIMEOUT = float(os.getenv('GRIST_READ_TIMEOUT', 30))
+    GRIST_RETRIES = int(os.getenv('GRIST_RETRIES', 3))
+    # Thread untuk mengambil beberapa tabel Grist paralel (view gabungan)
+    GRIST_FETCH_WORKERS = int(os.getenv('GRIST_FETCH_WORKERS', 6))
+
+    # Konfigurasi cache Grist (detik)
+    GRIST_CACHE_TTL = int(os.getenv('GRIST_CACHE_TTL', 60))
+    GRIST_CACHE_STALE_TTL = int(os.getenv('GRIST_CACHE_STALE_TTL', 600))
+    GRIST_WEBHOOK_SECRET = os.getenv('GRIST_WEBHOOK_SECRET')
+    GRIST_SNAPSHOT_PATH = os.getenv('GRIST_SNAPSHOT_PATH', 'grist_snapshot.sqlite3')
+    # Jumlah maksimum partisi (tabel, kolom, nilai) di memori, termasuk hasil kosong (LRU)
+    # Interval cek generasi tabel di snapshot store (perubahan webhook dari worker lain)
+    GRIST_CACHE_GENERATION_INTERVAL = float(os.getenv('GRIST_CACHE_GENERATION_INTERVAL', 1))
+    GRIST_CACHE_MAX_PARTITIONS = int(os.getenv('GRIST_CACHE_MAX_PARTITIONS', 1000))
+    GRIST_SYNC_RECONCILE_INTERVAL = int(os.getenv('GRIST_SYNC_RECONCILE_INTERVAL', 300))
+    # Jumlah baris per panggilan add_records untuk upload batch
+    GRIST_BATCH_CHUNK_SIZE = int(os.getenv('GRIST_BATCH_CHUNK_SIZE', 100))
+    # Antrean tulis Grist (write-behind): jeda penggabungan, batas retry, interval flush beat
+    GRIST_WRITE_FLUSH_DELAY = int(os.getenv('GRIST_WRITE_FLUSH_DELAY', 2))
+    GRIST_WRITE_MAX_ATTEMPTS = int(os.getenv('GRIST_WRITE_MAX_ATTEMPTS', 6))
+    GRIST_WRITE_SWEEP_INTERVAL = int(os.getenv('GRIST_WRITE_SWEEP_INTERVAL', 30))
+    GRIST_CACHE_TABLE_TTLS = {
+        'ItemMenu': 30,
+        'BranchQuota': 30,
+        'Options': 60,
+        'ItemOption': 60,
+        'ItemMenuPackage': 120,
+        'CategoryItemMenu': 300,
+        'Branch': 300,
+        'BranchCategory': 600,
+        'Tables_Area': 300,
+        'TablesSection': 300,
+        'Tables': 300,
+    }
 
     def __init__(self):
         self.db = self.connect_to_mongodb()
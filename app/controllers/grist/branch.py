@@ -1,5 +1,7 @@
 from flask import Blueprint, jsonify, current_app
 import requests
+from app.pagination import catalog_page
+from app.projection import project, requested_fields
 
 branch_controller = Blueprint("branch_controller", __name__)
 
@@ -7,14 +9,10 @@ branch_controller = Blueprint("branch_controller", __name__)
 def get_branch_category():
     try:
         api = current_app.api
-        response = api.fetch_table('BranchCategory')
-        keys = [
-            "ID", "RowID", "BranchCategoryCode", "BranchCategoryName", "BranchCategoryID"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
+        data = api.records('BranchCategory')
         return jsonify({
             "message": "Success get branch category",
-            "data": data
+            "data": project(data, requested_fields())
         }), 200
     except requests.exceptions.RequestException as e:
         return jsonify({'errorMessage': str(e)}), 500
@@ -23,21 +21,12 @@ def get_branch_category():
 def get_branch_category_by_id(BranchCategoryName):
     try:
         api = current_app.api
-        response = api.fetch_table('Branch')
-        keys = [
-            "ID", "RowID", "BranchName", "BranchPhone", "BranchID", 
-            "BranchNotes", "CreatedAt", "UpdatedAt", "Status", "IDCategory", 
-            "BranchCode","BranchWeekDayOpen", "BranchWeekEndOpen", "BranchWeekDayClosed",
-            "BranchImage", "BranchMinimumPurchase", "BranchWeekEndClosed", 
-            "BranchAddress", "BranchCategoryName", "BranchCategoryID"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-        filtered_items = [item for item in data if item['BranchCategoryName'] == BranchCategoryName]
+        filtered_items = api.lookup('Branch', 'BranchCategoryName', BranchCategoryName)
 
         if filtered_items:
             return jsonify({
             "message": "Success get Branch Category by ID",
-            "data": filtered_items
+            "data": project(filtered_items, requested_fields())
         }), 200
         else:
             return jsonify({'errorMessage': 'items not found'}), 404
@@ -48,19 +37,20 @@ def get_branch_category_by_id(BranchCategoryName):
 def get_branch():
     try:
         api = current_app.api
-        response = api.fetch_table('Branch')
-        keys = [
-            "ID", "RowID", "BranchName", "BranchPhone", "BranchID", 
-            "BranchNotes", "CreatedAt", "UpdatedAt", "Status", "IDCategory", 
-            "BranchCode","BranchWeekDayOpen", "BranchWeekEndOpen", "BranchWeekDayClosed",
-            "BranchImage", "BranchMinimumPurchase", "BranchWeekEndClosed", 
-            "BranchAddress", "BranchCategoryName", "BranchCategoryID"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-        return jsonify({
+        fields = requested_fields()
+        data, pagination = catalog_page(api, 'Branch')
+        if pagination is None and fields is None:
+            # Tanpa paging/fields tetap kirim baris mentah seperti sebelumnya
+            data = api.fetch_table('Branch')
+        response = {
             "message": "Success get branch",
-            "data": response
-        }), 200
+            "data": project(data, fields)
+        }
+        if pagination is not None:
+            response["pagination"] = pagination
+        return jsonify(response), 200
+    except ValueError as e:
+        return jsonify({'errorMessage': str(e)}), 400
     except requests.exceptions.RequestException as e:
         return jsonify({'errorMessage': str(e)}), 500
     
@@ -68,21 +58,12 @@ def get_branch():
 def get_branch_by_id(BranchCode):
     try:
         api = current_app.api
-        response = api.fetch_table('Branch')
-        keys = [
-            "ID", "RowID", "BranchName", "BranchPhone", "BranchID", 
-            "BranchNotes", "CreatedAt", "UpdatedAt", "Status", "IDCategory", 
-            "BranchCode","BranchWeekDayOpen", "BranchWeekEndOpen", "BranchWeekDayClosed",
-            "BranchImage", "BranchMinimumPurchase", "BranchWeekEndClosed", 
-            "BranchAddress", "BranchCategoryName", "BranchCategoryID"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-        filtered_items = [item for item in data if item['BranchCode'] == BranchCode]
+        filtered_items = api.lookup('Branch', 'BranchCode', BranchCode)
 
         if filtered_items:
             return jsonify({
             "message": "Success get itemMenu by ID",
-            "data": filtered_items
+            "data": project(filtered_items, requested_fields())
         }), 200
         else:
             return jsonify({'errorMessage': 'items not found'}), 404
@@ -93,18 +74,12 @@ def get_branch_by_id(BranchCode):
 def get_branch_quota(BranchCode):
     try:
         api = current_app.api
-        response = api.fetch_table('BranchQuota')
-        keys = [
-            "ID", "RowID", "IDBranch", "BranchQuotaTime", "BranchQuotaPax", 
-            "BranchQuotaID", "BranchName", "BranchCode"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-        filtered_items = [item for item in data if item['BranchCode'] == BranchCode]
+        filtered_items = api.lookup('BranchQuota', 'BranchCode', BranchCode)
 
         if filtered_items:
             return jsonify({
             "message": "Success get branch quota by branch",
-            "data": filtered_items
+            "data": project(filtered_items, requested_fields())
         }), 200
         else:
             return jsonify({'errorMessage': 'items not found'}), 404
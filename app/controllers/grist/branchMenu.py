@@ -0,0 +1,80 @@
+from flask import Blueprint, jsonify, current_app
+import requests
+from app.catalog_cache import catalog_cached
+
+branchMenu_controller = Blueprint("branchMenu_controller", __name__)
+
+BRANCH_MENU_TABLES = ('CategoryItemMenu', 'ItemMenu', "Options", "ItemOption", 'ItemMenuPackage')
+
+
+def build_branch_menu(api, BranchCode):
+    # Semua tabel diambil sekaligus (paralel kalau belum ada di cache)
+    category_snap, item_snap, option_snap, item_option_snap, package_snap = api.fetch_many([
+        ('CategoryItemMenu', 'BranchCode', BranchCode),
+        ('ItemMenu', 'BranchCode', BranchCode),
+        ("Options", 'BranchCode', BranchCode),
+        "ItemOption",
+        'ItemMenuPackage',
+    ])
+    categories = api.lookup('CategoryItemMenu', 'BranchCode', BranchCode, category_snap)
+    items = api.lookup('ItemMenu', 'BranchCode', BranchCode, item_snap)
+    options_by_menu = api.index("ItemOption", 'MenusID', item_option_snap)
+    packages_by_menu = api.index('ItemMenuPackage', 'IDPaket', package_snap)
+
+    category_nodes = {}
+    category_list = []
+    for category in categories:
+        node = dict(category, items=[])
+        category_nodes[category.get('CategoryItemID')] = node
+        category_list.append(node)
+
+    # Satu kali jalan: item langsung ditempel ke kategorinya beserta option dan paket
+    uncategorized = []
+    for item in items:
+        node = dict(
+            item,
+            options=options_by_menu.get(item.get('MenusID'), []),
+            packages=packages_by_menu.get(item.get('ID'), []),
+        )
+        category = category_nodes.get(item.get('CategoryItemID'))
+        if category is not None:
+            category['items'].append(node)
+        else:
+            uncategorized.append(node)
+
+    return {
+        "branchCode": BranchCode,
+        "categories": category_list,
+        "uncategorizedItems": uncategorized,
+        "options": api.lookup("Options", 'BranchCode', BranchCode, option_snap),
+    }
+
+
+@branchMenu_controller.route("/branch_menu/<string:BranchCode>", methods=["GET"])
+@catalog_cached(
+    ('CategoryItemMenu', 'BranchCode'),
+    ('ItemMenu', 'BranchCode'),
+    ("Options", 'BranchCode'),
+    "ItemOption",
+    'ItemMenuPackage',
+)
+def get_branch_menu(BranchCode):
+    try:
+        api = current_app.api
+
+        # View yang sudah dibangun catalog warmer dari data yang sama
+        published = api.published_view(f"branch_menu/{BranchCode}", BRANCH_MENU_TABLES)
+        if published is not None:
+            return current_app.response_class(published, status=200, mimetype="application/json")
+
+        data = build_branch_menu(api, BranchCode)
+
+        if data["categories"] or data["uncategorizedItems"]:
+            return jsonify({
+            "message": "Success get branch menu",
+            "data": data
+        }), 200
+        else:
+            return jsonify({'errorMessage': 'items not found'}), 404
+    except requests.exceptions.RequestException as e:
+        return jsonify({'errorMessage': str(e)}), 500
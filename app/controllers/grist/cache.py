@@ -0,0 +1,16 @@
+from flask import Blueprint, jsonify, current_app
+from app.middleware import role_required
+
+cache_controller = Blueprint("cache_controller", __name__)
+
+@cache_controller.route("/grist_cache", methods=["GET"])
+@role_required(["IT"])
+def get_cache_stats():
+    api = current_app.api
+    data = api.stats()
+    data["responses"] = current_app.catalog_cache.stats()
+    data["http"] = api.http_stats()
+    return jsonify({
+        "message": "Success get grist cache stats",
+        "data": data
+    }), 200
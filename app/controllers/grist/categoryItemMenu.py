@@ -1,5 +1,9 @@
 from flask import Blueprint, request, jsonify, current_app
 import requests
+from app.grist_batch import add_records_batch, batch_status, invalid_item
+from app.grist_writer import enqueue_grist_write
+from app.projection import project, requested_fields
+from app.catalog_cache import catalog_cached
 
 categoryItemMenu_controller = Blueprint("categoryItemMenu_controller", __name__)
 
@@ -8,38 +12,25 @@ categoryItemMenu_controller = Blueprint("categoryItemMenu_controller", __name__)
 def get_categoryItemMenu():
     try:
         api = current_app.api
-        response = api.fetch_table('CategoryItemMenu')
-        keys = [
-            "ID", "RowID", "CategoryName", "CreatedAt", "UpdatedAt", "Order", 
-            "Status", "IDBranch", "CategoryItemID", "Nol", 
-            "BranchCode", "BranchID", "BranchName", "CategoryImage"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
+        data = api.records('CategoryItemMenu')
         return jsonify({
             "message": "Success get categoryItemMenu",
-            "data": data
+            "data": project(data, requested_fields())
         }), 200
     except requests.exceptions.RequestException as e:
         return jsonify({'errorMessage': str(e)}), 500
     
 @categoryItemMenu_controller.route("/category_item_menu/<string:BranchCode>", methods=["GET"])
+@catalog_cached(("CategoryItemMenu", "BranchCode"))
 def get_categoryItemMenu_by_id(BranchCode):
     try:
         api = current_app.api
-        response = api.fetch_table('CategoryItemMenu')
-        keys = [
-            "ID", "RowID", "CategoryName", "CreatedAt", "UpdatedAt", "Order", 
-            "Status", "IDBranch", "CategoryItemID", "Nol", 
-            "BranchCode", "BranchID", "BranchName", "CategoryImage"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-
-        filtered_items = [item for item in data if item['BranchCode'] == BranchCode]
+        filtered_items = api.lookup('CategoryItemMenu', 'BranchCode', BranchCode)
 
         if filtered_items:
             return jsonify({
             "message": "Success get categoryItemMenu by ID",
-            "data": filtered_items
+            "data": project(filtered_items, requested_fields())
         }), 200
         else:
             return jsonify({'errorMessage': 'Category items not found'}), 404
@@ -55,6 +46,15 @@ def upload_categoryItemMenu(CategoryItemID):
 
     new_record['CategoryItemID'] = CategoryItemID
     records = [new_record]
+
+    # Tulis lewat antrean supaya request tidak menunggu Grist
+    # Record tunggal diteruskan apa adanya seperti add_records langsung, tanpa cek url
+    job_id = enqueue_grist_write(current_app, 'ImageCategoryUploaded', 'CategoryItemID', records, validate=False)
+    if job_id:
+        return jsonify({
+            "message": "Data masuk antrean",
+            "data": {"jobId": job_id, "status": "queued", "records": records}
+        }), 202
     
     try:
         api = current_app.api
@@ -64,4 +64,41 @@ def upload_categoryItemMenu(CategoryItemID):
         else:
             return jsonify({"message": "Gagal input data"}), 400
     except requests.exceptions.RequestException as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@categoryItemMenu_controller.route("/upload_category_url", methods=["POST"])
+def upload_categoryItemMenu_batch():
+    items = request.get_json()
+
+    if not items or not isinstance(items, list):
+        return jsonify({'error': 'No data provided'}), 400
+
+    errors = [invalid_item(item, 'CategoryItemID') for item in items]
+    records = [item for item, error in zip(items, errors) if not error]
+    job_id = enqueue_grist_write(current_app, 'ImageCategoryUploaded', 'CategoryItemID', records) if records else None
+    if job_id:
+        return jsonify({
+            "message": f"{len(records)} dari {len(items)} data masuk antrean",
+            "data": {
+                "jobId": job_id,
+                "status": "queued",
+                "items": [
+                    {"index": index, "status": "error", "error": error} if error else {"index": index, "status": "queued"}
+                    for index, error in enumerate(errors)
+                ],
+            }
+        }), 202
+
+    # MongoDB tidak tersedia: tulis langsung ke Grist
+    try:
+        api = current_app.api
+        results = add_records_batch(
+            api, 'ImageCategoryUploaded', items, 'CategoryItemID', current_app.config['GRIST_BATCH_CHUNK_SIZE']
+        )
+        created = sum(1 for result in results if result["status"] == "created")
+        return jsonify({
+            "message": f"{created} dari {len(items)} data berhasil diinput",
+            "data": results
+        }), batch_status(results)
+    except requests.exceptions.RequestException as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,5 +1,10 @@
 from flask import Blueprint, request, jsonify, current_app
 import requests
+from app.grist_batch import add_records_batch, batch_status, invalid_item
+from app.grist_writer import enqueue_grist_write
+from app.pagination import catalog_page
+from app.projection import project, requested_fields
+from app.catalog_cache import catalog_cached
 
 itemMenu_controller = Blueprint("itemMenu_controller", __name__)
 
@@ -7,42 +12,30 @@ itemMenu_controller = Blueprint("itemMenu_controller", __name__)
 def get_itemMenu():
     try:
         api = current_app.api
-        response = api.fetch_table('ItemMenu')
-        keys = [
-            "ID", "RowID", "MenuName", "Description", "MenuPrice", "MenusID", 
-            "CreatedAt", "UpdatedAt", "Status", "Order", "MenusCode", "MenusKind", 
-            "MenuSoldOut", "MenusSellLimit","Nol", "IDCategory", "IDBranch", 
-            "i_id", "CookingCharge", "MenuPackageDetail", "MenuPackage", "TaxFree",
-            "CategoryItemID", "BranchCode", "CategoryName", "BranchName", "MenusImage"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-        return jsonify({
+        data, pagination = catalog_page(api, 'ItemMenu')
+        response = {
             "message": "Success get itemMenu",
-            "data": data
-        }), 200
+            "data": project(data, requested_fields())
+        }
+        if pagination is not None:
+            response["pagination"] = pagination
+        return jsonify(response), 200
+    except ValueError as e:
+        return jsonify({'errorMessage': str(e)}), 400
     except requests.exceptions.RequestException as e:
         return jsonify({'errorMessage': str(e)}), 500
     
 @itemMenu_controller.route("/item_menu/<string:BranchCode>", methods=["GET"])
+@catalog_cached(("ItemMenu", "BranchCode"))
 def get_itemMenu_by_id(BranchCode):
     try:
         api = current_app.api
-        response = api.fetch_table('ItemMenu')
-        keys = [
-            "ID", "RowID", "MenuName", "Description", "MenuPrice", "MenusID", 
-            "CreatedAt", "UpdatedAt", "Status", "Order", "MenusCode", "MenusKind", 
-            "MenuSoldOut", "MenusSellLimit","Nol", "IDCategory", "IDBranch", 
-            "i_id", "CookingCharge", "MenuPackageDetail", "MenuPackage", "TaxFree",
-            "CategoryItemID", "BranchCode", "CategoryName", "BranchName", "MenusImage"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-
-        filtered_items = [item for item in data if item['BranchCode'] == BranchCode]
+        filtered_items = api.lookup('ItemMenu', 'BranchCode', BranchCode)
 
         if filtered_items:
             return jsonify({
             "message": "Success get itemMenu by ID",
-            "data": filtered_items
+            "data": project(filtered_items, requested_fields())
         }), 200
         else:
             return jsonify({'errorMessage': 'items not found'}), 404
@@ -58,6 +51,15 @@ def upload_menu(MenusID):
 
     new_record['MenusID'] = MenusID
     records = [new_record]
+
+    # Tulis lewat antrean supaya request tidak menunggu Grist
+    # Record tunggal diteruskan apa adanya seperti add_records langsung, tanpa cek url
+    job_id = enqueue_grist_write(current_app, 'ImageItemUploaded', 'MenusID', records, validate=False)
+    if job_id:
+        return jsonify({
+            "message": "Data masuk antrean",
+            "data": {"jobId": job_id, "status": "queued", "records": records}
+        }), 202
     
     try:
         api = current_app.api
@@ -67,4 +69,41 @@ def upload_menu(MenusID):
         else:
             return jsonify({"message": "Gagal input data"}), 400
     except requests.exceptions.RequestException as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@itemMenu_controller.route("/upload_menu_url", methods=["POST"])
+def upload_menu_batch():
+    items = request.get_json()
+
+    if not items or not isinstance(items, list):
+        return jsonify({'error': 'No data provided'}), 400
+
+    errors = [invalid_item(item, 'MenusID') for item in items]
+    records = [item for item, error in zip(items, errors) if not error]
+    job_id = enqueue_grist_write(current_app, 'ImageItemUploaded', 'MenusID', records) if records else None
+    if job_id:
+        return jsonify({
+            "message": f"{len(records)} dari {len(items)} data masuk antrean",
+            "data": {
+                "jobId": job_id,
+                "status": "queued",
+                "items": [
+                    {"index": index, "status": "error", "error": error} if error else {"index": index, "status": "queued"}
+                    for index, error in enumerate(errors)
+                ],
+            }
+        }), 202
+
+    # MongoDB tidak tersedia: tulis langsung ke Grist
+    try:
+        api = current_app.api
+        results = add_records_batch(
+            api, 'ImageItemUploaded', items, 'MenusID', current_app.config['GRIST_BATCH_CHUNK_SIZE']
+        )
+        created = sum(1 for result in results if result["status"] == "created")
+        return jsonify({
+            "message": f"{created} dari {len(items)} data berhasil diinput",
+            "data": results
+        }), batch_status(results)
+    except requests.exceptions.RequestException as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,5 +1,7 @@
 from flask import Blueprint, jsonify, current_app
 import requests
+from app.pagination import catalog_page
+from app.projection import project, requested_fields
 
 itemOption_controller = Blueprint("itemOption_controller", __name__)
 
@@ -8,18 +10,16 @@ itemOption_controller = Blueprint("itemOption_controller", __name__)
 def get_itemOption():
     try:
         api = current_app.api
-        response = api.fetch_table("ItemOption")
-        keys = [
-            "ID", "RowID", "IDBranch", "IDOption", "IDCategory", "ItemOptionID", 
-            "IDMenu", "CreatedAt", "UpdatedAt", "BranchName", "BranchID", 
-            "OptionName", "OptionsID", "CategoryMenuName", "CategoryItemID", 
-            "MenuName", "MenusID", "OptionText", "op_id"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-        return jsonify({
+        data, pagination = catalog_page(api, "ItemOption")
+        response = {
             "message": "Success get itemOption",
-            "data": data
-        }), 200
+            "data": project(data, requested_fields())
+        }
+        if pagination is not None:
+            response["pagination"] = pagination
+        return jsonify(response), 200
+    except ValueError as e:
+        return jsonify({'errorMessage': str(e)}), 400
     except requests.exceptions.RequestException as e:
         return jsonify({'errorMessage': str(e)}), 500
     
@@ -28,21 +28,12 @@ def get_itemOption():
 def get_itemOption_categoryId(CategoryItemID):
     try:
         api = current_app.api
-        response = api.fetch_table("ItemOption")
-        keys = [
-            "ID", "RowID", "IDBranch", "IDOption", "IDCategory", "ItemOptionID", 
-            "IDMenu", "CreatedAt", "UpdatedAt", "BranchName", "BranchID", 
-            "OptionName", "OptionsID", "CategoryMenuName", "CategoryItemID", 
-            "MenuName", "MenusID", "OptionText", "op_id"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-
-        filtered_items = [item for item in data if item['CategoryItemID'] == CategoryItemID]
+        filtered_items = api.lookup("ItemOption", 'CategoryItemID', CategoryItemID)
 
         if filtered_items:
             return jsonify({
             "message": "Success get itemOption by CategoryMenuName",
-            "data": filtered_items
+            "data": project(filtered_items, requested_fields())
         }), 200
         else:
             return jsonify({'errorMessage': 'items not found'}), 404
@@ -54,21 +45,12 @@ def get_itemOption_categoryId(CategoryItemID):
 def get_itemOption_menuId(MenusID):
     try:
         api = current_app.api
-        response = api.fetch_table("ItemOption")
-        keys = [
-            "ID", "RowID", "IDBranch", "IDOption", "IDCategory", "ItemOptionID", 
-            "IDMenu", "CreatedAt", "UpdatedAt", "BranchName", "BranchID", 
-            "OptionName", "OptionsID", "CategoryMenuName", "CategoryItemID", 
-            "MenuName", "MenusID", "OptionText", "op_id"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-
-        filtered_items = [item for item in data if item['MenusID'] == MenusID]
+        filtered_items = api.lookup("ItemOption", 'MenusID', MenusID)
 
         if filtered_items:
             return jsonify({
             "message": "Success get itemOption by MenuName",
-            "data": filtered_items
+            "data": project(filtered_items, requested_fields())
         }), 200
         else:
             return jsonify({'errorMessage': 'items not found'}), 404
@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify, current_app
 import requests
+from app.projection import project, requested_fields
+from app.catalog_cache import catalog_cached
 
 itemPackage_controller = Blueprint("itemPackage_controller", __name__)
 
@@ -7,42 +9,25 @@ itemPackage_controller = Blueprint("itemPackage_controller", __name__)
 def get_itemPackage():
     try:
         api = current_app.api
-        response = api.fetch_table('ItemMenuPackage')
-        keys = [
-            "ID", "RowID", "ItemPackageDetailID", "IDMenus", "IDPaket", 
-            "IDBranch", "IDOptionPackage", "AltMenuName", "IDItemOptionPackage",
-            "ItemPackageDetailPrice", "PackageID", "PackageName", "ItemPackageDetail", 
-            "BranchName", "ItemChild_i_id", "OptionPackage", "MaxChoosen", "BranchCode", 
-            "ItemOptionPackage", "Package_op_id", "MinChoosen", "AutoInsert", "ItemPackage_i_id" 
-        ]
-        data = [dict(zip(keys, item)) for item in response]
+        data = api.records('ItemMenuPackage')
         return jsonify({
             "message": "Success get item package",
-            "data": data
+            "data": project(data, requested_fields())
         }), 200
     except requests.exceptions.RequestException as e:
         return jsonify({'errorMessage': str(e)}), 500
     
 @itemPackage_controller.route("/item_package/<string:BranchCode>", methods=["GET"])
+@catalog_cached(("ItemMenuPackage", "BranchCode"))
 def get_itemPackage_by_id(BranchCode):
     try:
         api = current_app.api
-        response = api.fetch_table('ItemMenuPackage')
-        keys = [
-            "ID", "RowID", "ItemPackageDetailID", "IDMenus", "IDPaket", 
-            "IDBranch", "IDOptionPackage", "AltMenuName", "IDItemOptionPackage",
-            "PackageID", "PackageName", "ItemPackageDetail", "BranchName",  
-            "OptionPackage", "ItemPackage_i_id", "MaxChoosen", "BranchCode", 
-            "ItemOptionPackage", "ItemChild_i_id", "Package_op_id", "MinChoosen"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-
-        filtered_items = [item for item in data if item['BranchCode'] == BranchCode]
+        filtered_items = api.lookup('ItemMenuPackage', 'BranchCode', BranchCode)
 
         if filtered_items:
             return jsonify({
             "message": "Success get item package by Branch",
-            "data": filtered_items
+            "data": project(filtered_items, requested_fields())
         }), 200
         else:
             return jsonify({'errorMessage': 'items not found'}), 404
@@ -1,5 +1,8 @@
 from flask import Blueprint, jsonify, current_app
 import requests
+from app.pagination import catalog_page
+from app.projection import project, requested_fields
+from app.catalog_cache import catalog_cached
 
 option_controller = Blueprint("option_controller", __name__)
 
@@ -8,41 +11,31 @@ option_controller = Blueprint("option_controller", __name__)
 def get_option():
     try:
         api = current_app.api
-        response = api.fetch_table("Options")
-        keys = [
-            "ID", "RowID", "IDOptionsCategory", "OptionsCode", "OptionsHide", 
-            "OptionsPriceMod", "UpdatedAt", "Status", "OptionsName", "OptionsID", 
-            "IDBranch", "CreatedAt", "op_id", "BranchName", "BranchCode", 
-            "OptionsCategoryName", "OptionsCategoryID", "OptionsCategoryText"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-        return jsonify({
+        data, pagination = catalog_page(api, "Options")
+        response = {
             "message": "Success get option",
-            "data": data
-        }), 200
+            "data": project(data, requested_fields())
+        }
+        if pagination is not None:
+            response["pagination"] = pagination
+        return jsonify(response), 200
+    except ValueError as e:
+        return jsonify({'errorMessage': str(e)}), 400
     except requests.exceptions.RequestException as e:
         return jsonify({'errorMessage': str(e)}), 500
 
 
 @option_controller.route("/option/<string:BranchCode>", methods=["GET"])
+@catalog_cached(("Options", "BranchCode"))
 def get_option_by_id(BranchCode):
     try:
         api = current_app.api
-        response = api.fetch_table("Options")
-        keys = [
-            "ID", "RowID", "IDOptionsCategory", "OptionsCode", "OptionsHide", 
-            "OptionsPriceMod", "UpdatedAt", "Status", "OptionsName", "OptionsID", 
-            "IDBranch", "CreatedAt", "op_id", "BranchName", "BranchCode", 
-            "OptionsCategoryName", "OptionsCategoryID", "OptionsCategoryText"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-
-        filtered_items = [item for item in data if item['BranchCode'] == BranchCode]
+        filtered_items = api.lookup("Options", 'BranchCode', BranchCode)
 
         if filtered_items:
             return jsonify({
             "message": "Success get option by BranchCode",
-            "data": filtered_items
+            "data": project(filtered_items, requested_fields())
         }), 200
         else:
             return jsonify({'errorMessage': 'items not found'}), 404
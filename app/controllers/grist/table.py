@@ -1,26 +1,66 @@
 from flask import Blueprint, jsonify, current_app
 import requests
+from app.pagination import catalog_page
+from app.projection import project, requested_fields
+from app.catalog_cache import catalog_cached
 
 table_controller = Blueprint("table_controller", __name__)
+
+FLOOR_PLAN_TABLES = ('Tables_Area', 'TablesSection', 'Tables')
+
+
+def by_order(items):
+    return sorted(items, key=lambda item: (item.get('Order') is None, item.get('Order') or 0, item.get('ID') or 0))
+
+
+def build_floor_plan(api, BranchCode):
+    """
+    Denah branch: section -> meja, plus daftar area branch. Meja digabung ke
+    section lewat TableSectionID. TablesSection dan Tables tidak punya kolom
+    yang menunjuk ke area, jadi area dikirim sebagai daftar terpisah (tidak
+    bersarang). Meja tanpa section dikirim di unassignedTables supaya tidak hilang.
+    """
+    area_snap, section_snap, table_snap = api.fetch_many([
+        (table_name, 'BranchCode', BranchCode) for table_name in FLOOR_PLAN_TABLES
+    ])
+    areas = api.lookup('Tables_Area', 'BranchCode', BranchCode, area_snap)
+    sections = api.lookup('TablesSection', 'BranchCode', BranchCode, section_snap)
+    tables = api.lookup('Tables', 'BranchCode', BranchCode, table_snap)
+
+    section_nodes = {}
+    section_list = []
+    for section in by_order(sections):
+        node = dict(section, tables=[])
+        section_nodes[section.get('TableSectionID')] = node
+        section_list.append(node)
+
+    unassigned_tables = []
+    for table in by_order(tables):
+        section = section_nodes.get(table.get('TableSectionID'))
+        if section is not None:
+            section['tables'].append(table)
+        else:
+            unassigned_tables.append(table)
+
+    return {
+        "branchCode": BranchCode,
+        "areas": by_order(areas),
+        "sections": section_list,
+        "unassignedTables": unassigned_tables,
+    }
+
     
 @table_controller.route("/table_area/<string:BranchCode>", methods=["GET"])
+@catalog_cached(("Tables_Area", "BranchCode"))
 def get_table_area_branch(BranchCode):
     try:
         api = current_app.api
-        response = api.fetch_table('Tables_Area')
-        keys = [
-            "ID", "RowID", "AreaName", "Status", "TableAreaID", 
-            "IDBranch", "AreaCode", "ta_id", "CreatedAt", "UpdatedAt",   
-            "Order", "BranchID", "BranchCode", "AreaImage", "BranchName"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-
-        filtered_items = [item for item in data if item['BranchCode'] == BranchCode]
+        filtered_items = api.lookup('Tables_Area', 'BranchCode', BranchCode)
 
         if filtered_items:
             return jsonify({
             "message": "Success get table by branch",
-            "data": filtered_items
+            "data": project(filtered_items, requested_fields())
         }), 200
         else:
             return jsonify({'errorMessage': 'items not found'}), 404
@@ -31,20 +71,12 @@ def get_table_area_branch(BranchCode):
 def get_table_section_branch(BranchCode):
     try:
         api = current_app.api
-        response = api.fetch_table('TablesSection')
-        keys = [
-            "ID", "RowID", "TableSectionID", "IDBranch", "TableSectionImage", 
-            "TableSectionName", "Status", "CreatedAt", "UpdatedAt", "ts_id",
-            "BranchID", "Order", "BranchName", "BranchCode"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-
-        filtered_items = [item for item in data if item['BranchCode'] == BranchCode]
+        filtered_items = api.lookup('TablesSection', 'BranchCode', BranchCode)
 
         if filtered_items:
             return jsonify({
             "message": "Success get table by branch",
-            "data": filtered_items
+            "data": project(filtered_items, requested_fields())
         }), 200
         else:
             return jsonify({'errorMessage': 'items not found'}), 404
@@ -55,21 +87,12 @@ def get_table_section_branch(BranchCode):
 def get_table_branch(TableSectionName):
     try:
         api = current_app.api
-        response = api.fetch_table('Tables')
-
-        keys = [
-            "ID", "RowID", "TableNumber", "IDTableSection", 
-            "TableID", "Status", "CreatedAt", "UpdatedAt", "IDBranch", 
-            "t_id", "BranchCode", "TableSectionID", "TableSectionName", "BranchName"
-        ]
-        data = [dict(zip(keys, item)) for item in response]
-
-        filtered_items = [item for item in data if item['TableSectionName'] == TableSectionName]
+        filtered_items = api.lookup('Tables', 'TableSectionName', TableSectionName)
 
         if filtered_items:
             return jsonify({
             "message": "Success get table by branch",
-            "data": filtered_items
+            "data": project(filtered_items, requested_fields())
         }), 200
         else:
             return jsonify({'errorMessage': 'items not found'}), 404
@@ -80,11 +103,41 @@ def get_table_branch(TableSectionName):
 def get_table():
     try:
         api = current_app.api
-        response = api.fetch_table('Tables')
+        fields = requested_fields()
+        data, pagination = catalog_page(api, 'Tables')
+        if pagination is None and fields is None:
+            # Tanpa paging/fields tetap kirim baris mentah seperti sebelumnya
+            data = api.fetch_table('Tables')
 
-        return jsonify({
+        response = {
             "message": "Success get table by branch",
-            "data": response
+            "data": project(data, fields)
+        }
+        if pagination is not None:
+            response["pagination"] = pagination
+        return jsonify(response), 200
+    except ValueError as e:
+        return jsonify({'errorMessage': str(e)}), 400
+    except requests.exceptions.RequestException as e:
+        return jsonify({'errorMessage': str(e)}), 500
+
+@table_controller.route("/floor_plan/<string:BranchCode>", methods=["GET"])
+@catalog_cached(
+    ('Tables_Area', 'BranchCode'),
+    ('TablesSection', 'BranchCode'),
+    ('Tables', 'BranchCode'),
+)
+def get_floor_plan(BranchCode):
+    try:
+        api = current_app.api
+        data = build_floor_plan(api, BranchCode)
+
+        if data["areas"] or data["sections"] or data["unassignedTables"]:
+            return jsonify({
+            "message": "Success get floor plan",
+            "data": data
         }), 200
+        else:
+            return jsonify({'errorMessage': 'items not found'}), 404
     except requests.exceptions.RequestException as e:
-        return jsonify({'errorMessage': str(e)}), 500
\ No newline at end of file
+        return jsonify({'errorMessage': str(e)}), 500
@@ -0,0 +1,56 @@
+from flask import Blueprint, request, jsonify, current_app
+import hmac
+
+webhook_controller = Blueprint("webhook_controller", __name__)
+
+
+def normalize_records(payload):
+    # Grist mengirim list record datar; format {"id", "fields"} juga diterima
+    if isinstance(payload, list):
+        records = payload
+    elif isinstance(payload, dict) and isinstance(payload.get("records"), list):
+        records = payload["records"]
+    else:
+        raise ValueError("Payload harus list record atau object dengan records")
+    normalized = []
+    for record in records:
+        if not isinstance(record, dict) or not isinstance(record.get("fields", {}), dict):
+            raise ValueError("Setiap record harus berupa object")
+        if "fields" in record:
+            record = dict(record["fields"], id=record.get("id"))
+        normalized.append(record)
+    return normalized
+
+
+@webhook_controller.route("/grist_webhook/<string:TableName>", methods=["POST"])
+def grist_webhook(TableName):
+    secret = current_app.config['GRIST_WEBHOOK_SECRET']
+    token = request.args.get("token", "")
+    if not secret or not hmac.compare_digest(token, secret):
+        return jsonify({"message": "Invalid webhook token."}), 401
+
+    payload = request.get_json(silent=True)
+    if payload is None:
+        return jsonify({"error": "No data provided"}), 400
+
+    try:
+        records = normalize_records(payload)
+    except ValueError as e:
+        return jsonify({"errorMessage": str(e)}), 400
+
+    try:
+        api = current_app.api
+        if api.patch(TableName, records):
+            action = "patched"
+        else:
+            # Tidak ada snapshot penuh yang bisa di-patch, buang yang terkait saja
+            api.invalidate(TableName, records)
+            action = "invalidated"
+
+        return jsonify({
+            "message": "Webhook received",
+            "data": {"table": TableName, "rows": len(records), "action": action}
+        }), 200
+    except Exception as e:
+        print(f"Error in grist_webhook: {e}")
+        return jsonify({"errorMessage": f"Error in grist_webhook: {e}"}), 500
@@ -0,0 +1,44 @@
+from flask import Blueprint, jsonify, current_app
+from bson import ObjectId
+from bson.errors import InvalidId
+
+writeQueue_controller = Blueprint("writeQueue_controller", __name__)
+
+@writeQueue_controller.route("/grist_write/<string:jobId>", methods=["GET"])
+def get_grist_write_job(jobId):
+    try:
+        db = current_app.config['db']
+        collection = db.grist_write_jobs
+
+        try:
+            job = collection.find_one({"_id": ObjectId(jobId)})
+        except InvalidId:
+            job = None
+        if not job:
+            return jsonify({"errorMessage": "Job not found"}), 404
+
+        key_column = job.get("keyColumn")
+        return jsonify({
+            "message": "Success get Grist write job",
+            "data": {
+                "jobId": job["_id"],
+                "table": job.get("table"),
+                "status": job.get("status"),
+                "attempts": job.get("attempts", 0),
+                "nextAttemptAt": job.get("nextAttemptAt") if job.get("status") == "queued" else None,
+                "items": [
+                    {
+                        key_column: item["record"].get(key_column),
+                        "status": item.get("status"),
+                        "id": item.get("id"),
+                        "error": item.get("error"),
+                    }
+                    for item in job.get("items", [])
+                ],
+                "createdAt": job.get("createdAt"),
+                "updatedAt": job.get("updatedAt"),
+            }
+        }), 200
+    except Exception as e:
+        print(e)
+        return jsonify({"errorMessage": str(e)}), 500
@@ -0,0 +1,94 @@
+from flask import Blueprint, request, jsonify, current_app
+from datetime import datetime
+from app.middleware import role_required
+from app.occupancy import rebuild_slot_occupancy
+
+availability_controller = Blueprint("availability_controller", __name__)
+
+def parse_date(date_str):
+    """Terima YYYY-MM-DD atau format input reservasi (01 Jan 2025)."""
+    for date_format in ('%Y-%m-%d', '%d %b %Y'):
+        try:
+            return datetime.strptime(date_str, date_format).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    raise ValueError("Invalid date format")
+
+def quota_time(value):
+    """BranchQuotaTime ke format HH:MM yang dipakai di reservasi."""
+    if isinstance(value, (int, float)):
+        # Kolom waktu Grist bisa berupa detik sejak tengah malam
+        minutes = int(value) // 60
+        return f"{minutes // 60 % 24:02d}:{minutes % 60:02d}"
+    if isinstance(value, str):
+        for time_format in ('%H:%M', '%H:%M:%S', '%H.%M'):
+            try:
+                return datetime.strptime(value.strip(), time_format).strftime('%H:%M')
+            except ValueError:
+                continue
+    return value
+
+@availability_controller.route("/availability/<string:BranchCode>", methods=["GET"])
+def get_availability(BranchCode):
+    try:
+        date = request.args.get("date")
+        if not date:
+            return jsonify({"errorMessage": "date is required"}), 400
+        try:
+            date = parse_date(date)
+        except ValueError as e:
+            return jsonify({"errorMessage": str(e)}), 400
+
+        quotas = current_app.api.lookup('BranchQuota', 'BranchCode', BranchCode)
+        if not quotas:
+            return jsonify({"errorMessage": "quota not found"}), 404
+
+        db = current_app.config['db']
+        occupancy = {
+            slot["time"]: slot
+            for slot in db.slot_occupancy.find({"branchCode": BranchCode, "date": date})
+        }
+
+        slots = []
+        for quota in sorted(quotas, key=lambda quota: str(quota_time(quota.get("BranchQuotaTime")))):
+            time = quota_time(quota.get("BranchQuotaTime"))
+            quota_pax = quota.get("BranchQuotaPax") or 0
+            booked = occupancy.get(time, {})
+            booked_pax = booked.get("pax", 0)
+            slots.append({
+                "time": time,
+                "quotaPax": quota_pax,
+                "bookedPax": booked_pax,
+                "reservations": booked.get("reservations", 0),
+                "remainingPax": max(quota_pax - booked_pax, 0),
+            })
+
+        return jsonify({
+            "message": "Success get availability",
+            "data": {
+                "branchCode": BranchCode,
+                "date": date,
+                "slots": slots
+            }
+        }), 200
+    except Exception as e:
+        print(e)
+        return jsonify({"errorMessage": str(e)}), 500
+
+@availability_controller.route("/availability_rebuild", methods=["POST"])
+@role_required(["IT"])
+def rebuild_availability():
+    try:
+        branchCode = request.json.get("branchCode") if request.is_json else None
+        date = request.json.get("date") if request.is_json else None
+        if date:
+            date = parse_date(date)
+
+        task = rebuild_slot_occupancy.apply_async(args=[branchCode, date])
+        return jsonify({
+            "message": "Rebuild slot occupancy scheduled",
+            "data": {"taskId": task.id}
+        }), 202
+    except Exception as e:
+        print(e)
+        return jsonify({"errorMessage": str(e)}), 500
@@ -6,6 +6,8 @@ import json
 from bson import ObjectId
 from datetime import datetime, timedelta
 from app.middleware import role_required
+from app.projection import mongo_projection, project, requested_fields
+from app.streaming import stream_ndjson, wants_stream
 from app.celery_app import celery
 
 customer_controller = Blueprint("customer_controller", __name__)
@@ -321,6 +323,17 @@ def get_customer_by_id(customerId):
         print(e)
         return jsonify({"errorMessage": str(e)}), 500
 
+def format_customer(customer):
+    return {
+        "customerId": customer["_id"],
+        "name": customer.get("name"),
+        "email": customer.get("email"),
+        "phone": customer.get("phone"),
+        "status": customer.get("status"),
+        "createdAt": customer.get("createdAt"),
+        "updatedAt": customer.get("updatedAt")
+    }
+
 @customer_controller.route("/customer", methods=["GET"])
 @role_required(["IT", "Business Development", "Manager Accounting", "Assistant Manager Accounting", "Head Accounting", "GRO"])
 def get_customer():
@@ -328,24 +341,17 @@ def get_customer():
         db = current_app.config['db']
         collection = db.customer
 
-        customers = collection.find()
+        fields = requested_fields()
+        customers = collection.find({}, mongo_projection(fields, {"customerId": "_id"}))
 
-        customers_list = []
+        if wants_stream():
+            return stream_ndjson(customers, format_customer, fields)
 
-        for customer in customers:
-            customers_list.append({
-                "customerId": str(customer["_id"]),
-                "name": customer["name"],
-                "email": customer["email"],
-                "phone": customer["phone"],
-                "status": customer["status"],
-                "createdAt": customer["createdAt"].isoformat() + 'Z',
-                "updatedAt": customer["updatedAt"].isoformat() + 'Z'
-            })
+        customers_list = [format_customer(customer) for customer in customers]
 
         return jsonify({
             "message": "Success get customer",
-            "data": customers_list
+            "data": project(customers_list, fields)
         }), 200
     except Exception as e:
         print(e)
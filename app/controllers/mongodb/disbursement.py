@@ -3,6 +3,7 @@ import requests
 import os
 from datetime import datetime
 from app.middleware import role_required
+from app.streaming import stream_ndjson, wants_stream
 from bson import ObjectId
 
 def serialize_disbursement(disbursement):
@@ -133,6 +134,19 @@ def webhook_disbursement():
     except Exception as e:
         return jsonify({"error": f"Error in webhook: {e}"}), 500
 
+def format_disbursement(disbursement):
+    return {
+        "external_id": disbursement.get("external_id"),
+        "amount": disbursement.get("amount"),
+        "bank_code": disbursement.get("bank_code"),
+        "account_holder_name": disbursement.get("account_holder_name"),
+        "account_number": disbursement.get("account_number"),
+        "description": disbursement.get("description"),
+        "status": disbursement.get("status"),
+        "createdAt": disbursement.get("createdAt"),
+        "updatedAt": disbursement.get("updatedAt"),
+    }
+
 @disbursement_controller.route("/get_disbursements", methods=["GET"])
 @role_required(["IT", "Business Development", "Manager Accounting", "Assistant Manager Accounting", "Head Accounting", "Accounting"])
 def get_disbursements():
@@ -142,19 +156,10 @@ def get_disbursements():
 
         # Ambil semua data disbursement dari MongoDB
         disbursements = collection.find()
-        disbursement_list = []
-        for disbursement in disbursements:
-            disbursement_list.append({
-                "external_id": disbursement.get("external_id"),
-                "amount": disbursement.get("amount"),
-                "bank_code": disbursement.get("bank_code"),
-                "account_holder_name": disbursement.get("account_holder_name"),
-                "account_number": disbursement.get("account_number"),
-                "description": disbursement.get("description"),
-                "status": disbursement.get("status"),
-                "createdAt": disbursement.get("createdAt"),
-                "updatedAt": disbursement.get("updatedAt"),
-            })
+        if wants_stream():
+            return stream_ndjson(disbursements, format_disbursement)
+
+        disbursement_list = [format_disbursement(disbursement) for disbursement in disbursements]
 
         return jsonify({"message": "Disbursements fetched successfully", "data": disbursement_list}), 200
     except Exception as e:
@@ -7,6 +7,9 @@ from datetime import datetime, timedelta
 import pytz
 from app.celery_app import celery
 from app.middleware import role_required
+from app.occupancy import sync_occupancy
+from app.projection import mongo_projection, project, requested_fields
+from app.streaming import stream_ndjson, wants_stream
 
 invoice_controller = Blueprint("invoice_controller", __name__)
 
@@ -184,6 +187,7 @@ def expire_invoice(invoice_id, reservationId):
                 {"_id": ObjectId(reservationId), "status": "PENDING"},
                 {"$set": {"status": "EXPIRED"}}
             )
+            sync_occupancy(db, ObjectId(reservationId))
             print(f"Invoice {invoice_id} and Reservation {reservationId} marked as EXPIRED")
     except Exception as e:
         print(f"Error in expire_invoice: {e}")
@@ -304,6 +308,7 @@ def xendit_webhook():
                 {"_id": reservation_object_id},
                 {"$set": update_reservation_data}
             )
+            sync_occupancy(db, reservation_object_id)
 
             # Fetch customer data for WhatsApp message
             branch = reservation.get("branchName", "")
@@ -424,6 +429,29 @@ def send_email_smtp(to_email, subject, body):
         print(f"Failed to send email to {to_email}: {e}")
         
         
+def format_invoice(invoice):
+    return {
+        "invoiceId": invoice["_id"],
+        "branchCode": invoice.get("branchCode"),
+        "reservationCode": invoice.get("reservationCode", ""),
+        "expiry_date": invoice.get("expiry_date"),
+        "invoice_url": invoice.get("invoice_url"),
+        "external_id": invoice.get("external_id"),
+        "status": invoice.get("status"),
+        "refund_status": invoice.get("refund_status"),
+        "paid_amount": invoice.get("paid_amount", 0),
+        "mdr": invoice.get("mdr", 0),
+        "currency": invoice.get("currency"),
+        "paid_at": invoice.get("paid_at"),
+        "merchant_name": invoice.get("merchant_name"),
+        "bank_code": invoice.get("bank_code"),
+        "payment_channel": invoice.get("payment_channel"),
+        "payment_destination": invoice.get("payment_destination"),
+        "payment_method": invoice.get("payment_method"),
+        "created_at" : invoice.get("createdAt"),
+        "updated_at" : invoice.get("updated_at"),
+    }
+
 @invoice_controller.route("/invoice/<string:branchCode>", methods=["GET"])
 @role_required(["IT", "Business Development", "Manager Accounting", "Assistant Manager Accounting", "Head Accounting", "Accounting"])
 def get_invoice_by_branchCode(branchCode):
@@ -431,36 +459,21 @@ def get_invoice_by_branchCode(branchCode):
         db = current_app.config['db']
         collection = db.invoice
 
-        invoices = collection.find({"branchCode": branchCode})
-
-        invoice_list = []
-        for invoice in invoices:
-            invoice_list.append({
-                "invoiceId": str(invoice["_id"]),
-                "branchCode": invoice["branchCode"],
-                "reservationCode": invoice.get("reservationCode", ""),
-                "expiry_date": invoice.get("expiry_date"),
-                "invoice_url": invoice.get("invoice_url"),
-                "external_id": invoice.get("external_id"),
-                "status": invoice.get("status"),
-                "refund_status": invoice.get("refund_status"),
-                "paid_amount": invoice.get("paid_amount", 0),
-                "mdr": invoice.get("mdr", 0),
-                "currency": invoice.get("currency"),
-                "paid_at": invoice.get("paid_at"),
-                "merchant_name": invoice.get("merchant_name"),
-                "bank_code": invoice.get("bank_code"),
-                "payment_channel": invoice.get("payment_channel"),
-                "payment_destination": invoice.get("payment_destination"),
-                "payment_method": invoice.get("payment_method"),
-                "created_at" : invoice.get("createdAt"),
-                "updated_at" : invoice.get("updated_at"),
-            })
+        fields = requested_fields()
+        invoices = collection.find(
+            {"branchCode": branchCode},
+            mongo_projection(fields, {"invoiceId": "_id", "created_at": "createdAt"}),
+        )
+
+        if wants_stream():
+            return stream_ndjson(invoices, format_invoice, fields)
+
+        invoice_list = [format_invoice(invoice) for invoice in invoices]
 
         if invoice_list:
             return jsonify({
                 "message": "Success get invoices",
-                "data": invoice_list
+                "data": project(invoice_list, fields)
             }), 200
         else:
             return jsonify({"message": "No invoices found for this branch"}), 404
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime
 from app.middleware import role_required
+from app.streaming import stream_ndjson, wants_stream
 
 refund_controller = Blueprint("refund_controller", __name__)
 
@@ -67,6 +68,19 @@ def create_refund():
 
 
 
+def format_refund(refund):
+    return {
+        "external_id": refund.get("external_id"),
+        "reservationCode": refund.get("reservationCode"),
+        "branchCode": refund.get("branchCode"),
+        "bank_name": refund.get("bank_name"),
+        "account_number": refund.get("account_number"),
+        "account_holder": refund.get("account_holder"),
+        "phone": refund.get("phone"),
+        "refund_status": refund.get("refund_status"),
+        "created_at": refund.get("created_at"),
+    }
+
 @refund_controller.route("/refunds/<string:branchCode>", methods=["GET"])
 @role_required(["IT", "Business Development", "Manager Accounting", "Assistant Manager Accounting", "Head Accounting"])
 def get_refunds_by_branchCode(branchCode):
@@ -77,28 +91,16 @@ def get_refunds_by_branchCode(branchCode):
         # Filter refunds berdasarkan branchCode
         refunds_cursor = refund_collection.find({"branchCode": branchCode})
 
-        # Konversi cursor ke list
-        refunds_list = list(refunds_cursor)
+        if wants_stream():
+            return stream_ndjson(refunds_cursor, format_refund)
+
+        # Format data refund
+        formatted_refunds = [format_refund(refund) for refund in refunds_cursor]
 
         # Cek jika tidak ada data refund
-        if not refunds_list:
+        if not formatted_refunds:
             return jsonify({"message": "No refunds found for this branch"}), 404
 
-        # Format data refund
-        formatted_refunds = []
-        for refund in refunds_list:
-            formatted_refunds.append({
-                "external_id": refund.get("external_id"),
-                "reservationCode": refund.get("reservationCode"),
-                "branchCode": refund.get("branchCode"),
-                "bank_name": refund.get("bank_name"),
-                "account_number": refund.get("account_number"),
-                "account_holder": refund.get("account_holder"),
-                "phone": refund.get("phone"),
-                "refund_status": refund.get("refund_status"),
-                "created_at": refund.get("created_at"),
-            })
-
         return jsonify({"message": "Success", "data": formatted_refunds}), 200
 
     except Exception as e:
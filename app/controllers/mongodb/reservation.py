@@ -1,6 +1,11 @@
 from flask import Blueprint, request, jsonify, current_app
 from bson import ObjectId
+from bson.errors import InvalidId
 from datetime import datetime
+from app.occupancy import release_occupancy, sync_occupancy
+from app.pagination import decode_keyset, encode_keyset, page_limit
+from app.projection import mongo_projection, project, requested_view_fields
+from app.reservation_slots import slot_datetime, slot_range
 
 reservation_controller = Blueprint("reservation_controller", __name__)
 
@@ -10,6 +15,54 @@ def format_date(date_str):
 def format_time(time_str):
     return datetime.strptime(time_str, '%H:%M').strftime('%H:%M')
 
+# Field untuk ?view=summary di list reservasi; items dan customer lewat ?include= atau /reservation/<id>
+RESERVATION_SUMMARY_FIELDS = [
+    "reservationId", "reservationCode", "date", "time", "guest", "status",
+    "tableAreaName", "tableName", "arrivalStatus",
+]
+
+# Urutan stabil untuk keyset pagination, sesuai index branch_date_time_id
+RESERVATION_ORDER = [("date", 1), ("time", 1), ("_id", 1)]
+# Urutan untuk ?from=&to= (rentang slotAt), sesuai index branch_slotAt_id
+SLOT_ORDER = [("slotAt", 1), ("_id", 1)]
+
+def parse_iso_date(date_str):
+    try:
+        return datetime.strptime(date_str, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise ValueError("Invalid date format")
+
+def reservation_after(cursor):
+    """Filter reservasi yang urutannya setelah cursor (date, time, _id)."""
+    date, time, reservation_id = decode_keyset(cursor, 3)
+    try:
+        reservation_id = ObjectId(reservation_id)
+    except (InvalidId, TypeError):
+        raise ValueError("invalid cursor")
+    return {"$or": [
+        {"date": {"$gt": date}},
+        {"date": date, "time": {"$gt": time}},
+        {"date": date, "time": time, "_id": {"$gt": reservation_id}},
+    ]}
+
+def slot_after(cursor):
+    """Filter reservasi yang urutannya setelah cursor (slotAt, _id)."""
+    slot, reservation_id = decode_keyset(cursor, 2)
+    try:
+        slot = datetime.fromisoformat(slot)
+        reservation_id = ObjectId(reservation_id)
+    except (InvalidId, TypeError, ValueError):
+        raise ValueError("invalid cursor")
+    return {"$or": [
+        {"slotAt": {"$gt": slot}},
+        {"slotAt": slot, "_id": {"$gt": reservation_id}},
+    ]}
+
+def reservation_cursor(reservation, by_slot):
+    if by_slot:
+        return encode_keyset([reservation["slotAt"].isoformat(), str(reservation["_id"])])
+    return encode_keyset([reservation.get("date"), reservation.get("time"), str(reservation["_id"])])
+
 @reservation_controller.route("/reservation", methods=["POST"])
 def create_reservation():
     try:
@@ -56,11 +109,13 @@ def create_reservation():
         "tableAreaName": tableAreaName,
         "tableName": tableName,
         "arrivalStatus": arrivalStatus,
+        "slotAt": slot_datetime(date, time),
         "createdAt": datetime.utcnow(),
         "updatedAt": datetime.utcnow()
         }
 
         inserted_id = collection.insert_one(new_reservation).inserted_id
+        sync_occupancy(db, inserted_id)
         new_reservation = collection.find_one({"_id": inserted_id})
         
         return jsonify({
@@ -86,6 +141,7 @@ def create_reservation():
                 "tableAreaName": new_reservation["tableAreaName"],
                 "tableName": new_reservation["tableName"],
                 "arrivalStatus": new_reservation["arrivalStatus"],
+                "slotAt": new_reservation.get("slotAt"),
                 "createdAt": new_reservation["createdAt"].isoformat() + 'Z',
                 "updatedAt": new_reservation["updatedAt"].isoformat() + 'Z'
             }
@@ -112,23 +168,58 @@ def get_reservations_by_branchCode(branchCode):
         # Tambahkan filter jika parameter ada
         if branch_name:
             query["branchName"] = branch_name
+        # Rentang: ?dateFrom=&dateTo= (YYYY-MM-DD, inklusif) pada date, atau
+        # ?from= (inklusif) &to= (eksklusif) pada slotAt; keduanya tidak boleh dicampur
+        slot_filter = slot_range(request.args)
+        if slot_filter and (request.args.get("dateFrom") or request.args.get("dateTo")):
+            raise ValueError("Use either dateFrom/dateTo or from/to, not both")
         if date:
             query["date"] = date
+        elif not slot_filter:
+            date_range = {}
+            if request.args.get("dateFrom"):
+                date_range["$gte"] = parse_iso_date(request.args["dateFrom"])
+            if request.args.get("dateTo"):
+                date_range["$lte"] = parse_iso_date(request.args["dateTo"])
+            if date_range:
+                query["date"] = date_range
         if status:
             query["status"] = status
+        if slot_filter:
+            query["slotAt"] = slot_filter
+
+        fields = requested_view_fields(RESERVATION_SUMMARY_FIELDS)
+        projection = mongo_projection(fields, {"reservationId": "_id"})
 
-        reservations = collection.find(query)
+        # Keyset pagination: ?limit= dan ?after=<nextCursor>, urut (date, time, _id);
+        # dengan ?from=/?to= urut (slotAt, _id) supaya filter dan urutan dari satu index
+        limit = request.args.get("limit")
+        after = request.args.get("after")
+        paged = limit is not None or after is not None
+        by_slot = slot_filter is not None
+        if paged:
+            limit = page_limit(limit)
+            if after:
+                query = {"$and": [query, slot_after(after) if by_slot else reservation_after(after)]}
+            if projection is not None:
+                projection.update({"slotAt": 1} if by_slot else {"date": 1, "time": 1})
+            order = SLOT_ORDER if by_slot else RESERVATION_ORDER
+            reservations = list(collection.find(query, projection).sort(order).limit(limit + 1))
+            has_more = len(reservations) > limit
+            reservations = reservations[:limit]
+        else:
+            reservations = collection.find(query, projection)
 
         reservation_list = []
         for reservation in reservations:
             reservation_list.append({
-                "reservationId": str(reservation["_id"]),
+                "reservationId": reservation.get("_id"),
                 "customer": reservation.get("customer", {
                     "name": "N/A",
                     "phone": "N/A",
                     "email": "N/A"
                 }),
-                "branchCode": reservation["branchCode"],
+                "branchCode": reservation.get("branchCode"),
                 "branchName": reservation.get("branchName"),
                 "reservationCode": reservation.get("reservationCode", ""),
                 "date": reservation.get("date"),
@@ -146,18 +237,32 @@ def get_reservations_by_branchCode(branchCode):
                 "tableAreaName": reservation.get("tableAreaName", None),
                 "tableName": reservation.get("tableName", None),
                 "arrivalStatus": reservation.get("arrivalStatus", None),
-                "createdAt": reservation["createdAt"].isoformat() + 'Z',
-                "updatedAt": reservation["updatedAt"].isoformat() + 'Z'
+                "slotAt": reservation.get("slotAt"),
+                "createdAt": reservation.get("createdAt"),
+                "updatedAt": reservation.get("updatedAt")
             })
 
+        if paged:
+            last = reservations[-1] if reservations and has_more else None
+            return jsonify({
+                "message": "Success get reservations",
+                "data": project(reservation_list, fields),
+                "pagination": {
+                    "limit": limit,
+                    "nextCursor": reservation_cursor(last, by_slot) if last else None
+                }
+            }), 200
+
         if reservation_list:
             return jsonify({
                 "message": "Success get reservations",
-                "data": reservation_list
+                "data": project(reservation_list, fields)
             }), 200
         else:
             return jsonify({"message": "No reservations found for this branch"}), 404
 
+    except ValueError as e:
+        return jsonify({"errorMessage": str(e)}), 400
     except Exception as e:
         print(e)
         return jsonify({"errorMessage": str(e)}), 500
@@ -254,6 +359,11 @@ def update_reservation(reservationId):
             return jsonify({"message": "Reservation not found"}), 404
         
         updated_reservation = collection.find_one({"_id": ObjectId(reservationId)})
+        if "date" in updated_data or "time" in updated_data:
+            # slotAt selalu dihitung ulang dari date/time yang tersimpan
+            updated_reservation["slotAt"] = slot_datetime(updated_reservation.get("date"), updated_reservation.get("time"))
+            collection.update_one({"_id": updated_reservation["_id"]}, {"$set": {"slotAt": updated_reservation["slotAt"]}})
+        sync_occupancy(db, ObjectId(reservationId))
         
         return jsonify({
             "message": "Reservation updated successfully",
@@ -278,6 +388,7 @@ def update_reservation(reservationId):
                 "tableAreaName": updated_reservation["tableAreaName"],
                 "tableName": updated_reservation["tableName"],
                 "arrivalStatus": updated_reservation["arrivalStatus"],
+                "slotAt": updated_reservation.get("slotAt"),
                 "createdAt": updated_reservation["createdAt"].isoformat() + 'Z',
                 "updatedAt": updated_reservation["updatedAt"].isoformat() + 'Z'
             }
@@ -294,10 +405,12 @@ def delete_reservation(reservationId):
         db = current_app.config['db']
         collection = db.reservation
         
-        result = collection.delete_one({"_id": ObjectId(reservationId)})
+        deleted = collection.find_one_and_delete({"_id": ObjectId(reservationId)})
         
-        if result.deleted_count == 0:
+        if deleted is None:
             return jsonify({"message": "Reservation not found"}), 404
+
+        release_occupancy(db, deleted)
         
         return jsonify({"message": "Reservation deleted successfully"}), 200
 
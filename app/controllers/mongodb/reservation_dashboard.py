@@ -1,6 +1,10 @@
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime
 from app.middleware import role_required
+from app.projection import mongo_projection, project, requested_view_fields
+from app.streaming import stream_ndjson, wants_stream
+from app.controllers.mongodb.reservation import RESERVATION_SUMMARY_FIELDS
+from app.reservation_slots import slot_range
 
 reservation_dashboard_controller = Blueprint("reservation_dashboard_controller", __name__)
     
@@ -95,8 +99,8 @@ def get_reservation_summary(branchCode):
                 "totalAmountBeforeMdr": summary.get("totalAmountBeforeMdr"),
                 "totalAmountAfterMdr": summary.get("totalAmountAfterMdr"),
                 "status": summary.get("status"),
-                "createdAt": summary.get("createdAt").isoformat() + 'Z' if summary.get("createdAt") else None,
-                "updatedAt": summary.get("updatedAt").isoformat() + 'Z' if summary.get("updatedAt") else None
+                "createdAt": summary.get("createdAt"),
+                "updatedAt": summary.get("updatedAt")
             })
 
         if summary_list:
@@ -111,6 +115,34 @@ def get_reservation_summary(branchCode):
         print(f"Error fetching reservation summary for branchCode {branchCode}: {e}")
         return jsonify({"errorMessage": str(e)}), 500
     
+def format_dashboard_reservation(reservation):
+    return {
+        "reservationId": reservation.get("_id"),
+        "customer": reservation.get("customer"),
+        "branchCode": reservation.get("branchCode"),
+        "branchName": reservation.get("branchName"),
+        "reservationCode": reservation.get("reservationCode", ""),
+        "date": reservation.get("date"),
+        "time": reservation.get("time"),
+        "guest": reservation.get("guest"),
+        "status": reservation.get("status"),
+        "amount": reservation.get("amount", 0),
+        "tax": reservation.get("tax", 0),
+        "cookingCharge": reservation.get("cookingCharge", 0),
+        "totalAmount": reservation.get("totalAmount", 0),
+        "mdr": reservation.get("mdr", 0),
+        "isDisbursed": reservation.get("isDisbursed", False),
+        "note": reservation.get("note"),
+        "items": reservation.get("items", []),
+        "isPosted": reservation.get("isPosted", None),
+        "tableAreaName": reservation.get("tableAreaName", None),
+        "tableName": reservation.get("tableName", None),
+        "arrivalStatus": reservation.get("arrivalStatus", None),
+        "slotAt": reservation.get("slotAt"),
+        "createdAt": reservation.get("createdAt"),
+        "updatedAt": reservation.get("updatedAt")
+    }
+
 @reservation_dashboard_controller.route("/reservation_dashboard/<string:branchCode>", methods=["GET"])
 @role_required(["IT", "Business Development", "Manager Accounting", "Assistant Manager Accounting", "Head Accounting", "GRO"])
 def get_reservations_dashboard(branchCode):
@@ -118,44 +150,32 @@ def get_reservations_dashboard(branchCode):
         db = current_app.config['db']
         collection = db.reservation
 
-        reservations = collection.find({"branchCode":branchCode})
-
-        reservation_list = []
-        for reservation in reservations:
-            reservation_list.append({
-                "reservationId": str(reservation["_id"]),
-                "customer": reservation.get("customer"),
-                "branchCode": reservation.get("branchCode"),
-                "branchName": reservation.get("branchName"),
-                "reservationCode": reservation.get("reservationCode", ""),
-                "date": reservation.get("date"),
-                "time": reservation.get("time"),
-                "guest": reservation.get("guest"),
-                "status": reservation.get("status"),
-                "amount": reservation.get("amount", 0),
-                "tax": reservation.get("tax", 0),
-                "cookingCharge": reservation.get("cookingCharge", 0),
-                "totalAmount": reservation.get("totalAmount", 0),
-                "mdr": reservation.get("mdr", 0),
-                "isDisbursed": reservation.get("isDisbursed", False),
-                "note": reservation.get("note"),
-                "items": reservation.get("items", []),
-                "isPosted": reservation.get("isPosted", None),
-                "tableAreaName": reservation.get("tableAreaName", None),
-                "tableName": reservation.get("tableName", None),
-                "arrivalStatus": reservation.get("arrivalStatus", None),
-                "createdAt": reservation["createdAt"].isoformat() + 'Z',
-                "updatedAt": reservation["updatedAt"].isoformat() + 'Z'
-            })
+        query = {"branchCode": branchCode}
+        # ?from=&to= : range scan slotAt (UTC) lewat index branch_slotAt_id, urut waktu slot
+        slot_filter = slot_range(request.args)
+        if slot_filter:
+            query["slotAt"] = slot_filter
+
+        fields = requested_view_fields(RESERVATION_SUMMARY_FIELDS + ["isPosted"])
+        reservations = collection.find(query, mongo_projection(fields, {"reservationId": "_id"}))
+        if slot_filter:
+            reservations = reservations.sort("slotAt", 1)
+
+        if wants_stream():
+            return stream_ndjson(reservations, format_dashboard_reservation, fields)
+
+        reservation_list = [format_dashboard_reservation(reservation) for reservation in reservations]
 
         if reservation_list:
             return jsonify({
                 "message": "Success get reservations",
-                "data": reservation_list
+                "data": project(reservation_list, fields)
             }), 200
         else:
             return jsonify({"message": "No reservations found for this branch"}), 404
 
+    except ValueError as e:
+        return jsonify({"errorMessage": str(e)}), 400
     except Exception as e:
         print(e)
         return jsonify({"errorMessage": str(e)}), 500
\ No newline at end of file
@@ -8,6 +8,7 @@ from bson import ObjectId
 from datetime import datetime, timedelta
 import pytz 
 from app.middleware import role_required
+from app.streaming import stream_ndjson, wants_stream
 
 user_controller = Blueprint("user_controller", __name__)
 
@@ -137,6 +138,20 @@ def create_user():
         print(e)
         return jsonify({"errorMessage": str(e)}), 500
     
+def format_user(user):
+    return {
+        "userId": str(user["_id"]),
+        "name": user["name"],
+        "phone": user["phone"],
+        "role": user["role"],
+        "photo": user["photo"],
+        "status": user["status"],
+        "branchCode": user["branchCode"],
+        "lastLogin": user["lastLogin"].isoformat(),
+        "createdAt": user["createdAt"].isoformat() + 'Z',
+        "updatedAt": user["updatedAt"].isoformat() + 'Z'
+    }
+
 @user_controller.route("/user", methods=["GET"])
 @role_required(["IT"])
 def get_users():
@@ -144,20 +159,10 @@ def get_users():
         db = current_app.config['db']
         collection = db.user
 
-        users = []
-        for user in collection.find():
-            users.append({
-                "userId": str(user["_id"]),
-                "name": user["name"],
-                "phone": user["phone"],
-                "role": user["role"],
-                "photo": user["photo"],
-                "status": user["status"],
-                "branchCode": user["branchCode"],
-                "lastLogin": user["lastLogin"].isoformat(),
-                "createdAt": user["createdAt"].isoformat() + 'Z',
-                "updatedAt": user["updatedAt"].isoformat() + 'Z'
-            })
+        if wants_stream():
+            return stream_ndjson(collection.find(), format_user)
+
+        users = [format_user(user) for user in collection.find()]
 
         return jsonify({
             "message": "Users retrieved successfully.",
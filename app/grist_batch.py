@@ -0,0 +1,73 @@
+import requests
+
+
+def invalid_item(item, key_column):
+    """Pesan error kalau item upload tidak lengkap, atau None."""
+    if not isinstance(item, dict) or not item.get(key_column) or not item.get("url"):
+        return f"{key_column} dan url wajib diisi"
+    return None
+
+
+def write_error_type(e):
+    """
+    Jenis kegagalan add_records. add_records tidak idempoten, jadi hanya
+    "connection" (koneksi gagal dibuat) dan "server" (Grist membalas 5xx)
+    yang aman diulang; "timeout" berarti baris mungkin sudah tersimpan,
+    "rejected" berarti Grist menolak datanya (4xx).
+    """
+    if isinstance(e, requests.exceptions.ConnectTimeout):
+        return "connection"
+    if isinstance(e, requests.exceptions.Timeout):
+        return "timeout"
+    if isinstance(e, requests.exceptions.ConnectionError):
+        return "connection"
+    response = getattr(e, "response", None)
+    if response is not None:
+        return "server" if response.status_code >= 500 else "rejected"
+    return "timeout"
+
+
+def add_records_batch(api, table_name, items, key_column, chunk_size=100, validate=True):
+    """
+    Tulis banyak record ke tabel Grist dengan satu add_records per chunk.
+
+    Item yang tidak punya key_column atau url ditolak tanpa memanggil Grist
+    (kecuali validate=False, untuk record tunggal yang diteruskan apa adanya).
+    Kalau satu chunk gagal, hanya item di chunk itu yang ditandai error,
+    dengan errorType dari write_error_type (atau "validation").
+    Kembalikan hasil per item dengan urutan yang sama seperti input.
+    """
+    results = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        error = invalid_item(item, key_column) if validate else None
+        if error:
+            results[index] = {"index": index, "status": "error", "error": error, "errorType": "validation"}
+        else:
+            valid.append((index, item))
+
+    for start in range(0, len(valid), chunk_size):
+        chunk = valid[start:start + chunk_size]
+        try:
+            row_ids = api.add_records(table_name, [item for _, item in chunk])
+        except requests.exceptions.RequestException as e:
+            print(f"Error add_records {table_name}: {e}")
+            error_type = write_error_type(e)
+            for index, item in chunk:
+                results[index] = {
+                    "index": index, key_column: item.get(key_column), "status": "error",
+                    "error": str(e), "errorType": error_type,
+                }
+            continue
+        for (index, item), row_id in zip(chunk, row_ids):
+            results[index] = {"index": index, key_column: item.get(key_column), "status": "created", "id": row_id}
+
+    return results
+
+
+def batch_status(results):
+    """201 kalau semua berhasil, 207 kalau sebagian, 400 kalau tidak ada yang masuk."""
+    created = sum(1 for result in results if result["status"] == "created")
+    if created == len(results):
+        return 201
+    return 207 if created else 400
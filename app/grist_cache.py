@@ -0,0 +1,615 @@
+import itertools
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from flask import g, has_request_context
+from .grist_schema import SchemaRegistry, grist_column
+
+
+def table_of(key):
+    return key if isinstance(key, str) else key[0]
+
+
+class TableSnapshot:
+    """Satu salinan isi tabel Grist beserta waktu pengambilannya."""
+
+    __slots__ = (
+        "table", "rows", "fetched_at", "version", "base_version", "from_disk", "digest",
+        "_records", "_indexes", "_ordered",
+    )
+
+    def __init__(self, table, rows, fetched_at=None, version=0, from_disk=False, digest=None, base_version=None):
+        self.table = table
+        self.rows = rows
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+        self.version = version
+        # Versi saat isi tabel terakhir diganti penuh; patch webhook tidak mengubahnya
+        self.base_version = version if base_version is None else base_version
+        self.from_disk = from_disk
+        self.digest = digest
+        self._records = {}
+        self._indexes = {}
+        self._ordered = {}
+
+    @property
+    def age(self):
+        return time.time() - self.fetched_at
+
+    def records(self, schema):
+        """Baris sebagai dict menurut schema, dibuat sekali per snapshot."""
+        data = self._records.get(schema)
+        if data is None:
+            data = self._records[schema] = schema.to_records(self.rows)
+        return data
+
+    def ordered(self, schema):
+        """(row ids, records) urut row id Grist, dipakai untuk paging dengan cursor."""
+        ordered = self._ordered.get(schema)
+        if ordered is None:
+            pairs = sorted(zip([row.id for row in self.rows], self.records(schema)), key=lambda pair: pair[0])
+            ordered = self._ordered[schema] = ([pair[0] for pair in pairs], [pair[1] for pair in pairs])
+        return ordered
+
+    def index(self, schema, column):
+        """Index sekunder: nilai kolom -> list baris (dict) yang sudah dikelompokkan."""
+        cache_key = (schema, column)
+        index = self._indexes.get(cache_key)
+        if index is None:
+            index = {}
+            for item in self.records(schema):
+                index.setdefault(item.get(column), []).append(item)
+            self._indexes[cache_key] = index
+        return index
+
+
+class CachedGristAPI:
+    """
+    Pembungkus GristDocAPI dengan cache TTL per tabel.
+
+    Selama umur snapshot masih di bawah TTL, fetch_table dilayani dari memori.
+    Setelah TTL lewat tapi masih dalam jendela stale, data lama tetap dikirim
+    sementara refresh berjalan di background (stale-while-revalidate). Method
+    lain (add_records, call, dst.) diteruskan langsung ke API aslinya.
+
+    Kalau sync (GristSyncEngine) diberikan, refresh hanya menarik baris yang
+    berubah; snapshot yang tidak berubah dipertahankan beserta index-nya.
+
+    Kalau store (SnapshotStore) diberikan, setiap snapshot tabel yang berubah
+    ditulis ke disk dan bisa dimuat lagi saat start lewat load_persisted().
+    Store yang sama dipakai bersama antar proses: sebelum ke Grist, snapshot
+    yang sudah disegarkan proses lain (mis. catalog warmer) diambil dari disk.
+    Saat refresh gagal, snapshot lama tetap dilayani.
+
+    Perubahan dari webhook (patch/invalidate) disiarkan lewat generasi tabel
+    di store; setiap proses mengecek generasi paling sering tiap
+    generation_interval detik dan menganggap snapshot tabel yang berubah
+    kedaluwarsa, jadi data baru terlihat di semua worker dalam hitungan detik.
+
+    Partisi (tabel, kolom, nilai) berasal dari argumen URL, jadi disimpan
+    dalam LRU berukuran max_partitions; partisi yang dibuang ikut
+    membersihkan lock-nya.
+    """
+
+    def __init__(self, api, default_ttl=60, stale_ttl=600, table_ttls=None, sync=None, store=None, fetch_workers=6,
+                 max_partitions=1000, generation_interval=1):
+        self._api = api
+        self._sync = sync
+        self._persist = store
+        self.schemas = SchemaRegistry(api)
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.table_ttls = dict(table_ttls or {})
+
+        self._lock = threading.Lock()
+        self._table_locks = {}
+        self._snapshots = {}
+        # Key partisi dengan urutan LRU (paling lama dipakai di depan)
+        self._partitions = OrderedDict()
+        self.max_partitions = max_partitions
+        # Versi unik global, jadi key yang dibuang lalu diambil ulang tidak memakai versi lama
+        self._version_seq = itertools.count(1)
+        self.generation_interval = generation_interval
+        self._generations = None
+        self._generations_checked = 0
+        self._patched = {}
+        self._refreshing = set()
+        # Pool untuk fetch_many; jumlah thread <= ukuran pool koneksi HTTP
+        self._executor = ThreadPoolExecutor(max_workers=fetch_workers, thread_name_prefix="grist-fetch")
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.remote_invalidations = 0
+
+    def __getattr__(self, name):
+        return getattr(self._api, name)
+
+    def ttl_for(self, key):
+        return self.table_ttls.get(table_of(key), self.default_ttl)
+
+    def fetch_table(self, table_name, filters=None):
+        if filters:
+            return self._api.fetch_table(table_name, filters=filters)
+        return self.snapshot(table_name).rows
+
+    def snapshot(self, key):
+        """
+        Snapshot untuk key: nama tabel (seluruh tabel) atau tuple
+        (tabel, kolom, nilai) untuk partisi yang difilter di sisi Grist.
+        """
+        snap = self._snapshot(key)
+        if has_request_context():
+            # Dipakai untuk header Age pada response katalog
+            g.grist_age = max(g.get("grist_age", 0), snap.age)
+        return snap
+
+    def _snapshot(self, key):
+        self._check_generations()
+        with self._lock:
+            snap = self._snapshots.get(key)
+
+        if snap is None:
+            with self._lock:
+                self.misses += 1
+            return self._refresh_locked(key)
+
+        ttl = self.ttl_for(key)
+        age = snap.age
+        if not isinstance(key, str):
+            with self._lock:
+                if key in self._partitions:
+                    self._partitions.move_to_end(key)
+        if age < ttl:
+            with self._lock:
+                self.hits += 1
+            return snap
+
+        if age < ttl + self.stale_ttl or snap.from_disk:
+            # Snapshot dari disk selalu dilayani dulu, refresh di background
+            with self._lock:
+                self.stale_hits += 1
+            self._refresh_in_background(key)
+            return snap
+
+        # Sudah terlalu lama, ambil ulang secara sinkron
+        with self._lock:
+            self.misses += 1
+        return self._refresh_locked(key, stale=snap)
+
+    def load_persisted(self):
+        """Muat snapshot terakhir dari disk; dipanggil sekali saat start."""
+        if self._persist is None:
+            return 0
+        try:
+            saved = self._persist.load()
+        except Exception as e:
+            print(f"Error loading Grist snapshot file: {e}")
+            return 0
+        with self._lock:
+            for table_name, fetched_at, digest, rows in saved:
+                if table_name in self._snapshots:
+                    continue
+                version = next(self._version_seq)
+                self._snapshots[table_name] = TableSnapshot(
+                    table_name, rows, fetched_at=fetched_at, version=version, from_disk=True, digest=digest
+                )
+        return len(saved)
+
+    def is_warm(self, key):
+        self._check_generations()
+        with self._lock:
+            snap = self._snapshots.get(key)
+        return snap is not None and (snap.from_disk or snap.age < self.ttl_for(key) + self.stale_ttl)
+
+    def view(self, table_name, column, value):
+        """
+        Snapshot yang memuat baris dengan column == value. Kalau snapshot
+        seluruh tabel sudah hangat, itu yang dipakai; kalau belum, filter
+        didorong ke Grist sehingga yang diunduh hanya baris yang relevan.
+        """
+        key = (table_name, column, value)
+        if has_request_context():
+            # Snapshot yang sudah dipakai catalog_cached untuk versi response ini
+            pinned = g.get("grist_views", {}).get(key)
+            if pinned is not None:
+                return pinned
+        if self.is_warm(table_name):
+            return self.snapshot(table_name)
+        if not self.is_warm(key) and self._pull_shared_locked(table_name):
+            # Proses lain sudah menyimpan snapshot penuh yang segar
+            return self.snapshot(table_name)
+        return self.snapshot(key)
+
+    def fetch_many(self, specs):
+        """
+        Snapshot untuk beberapa spec sekaligus, urut sesuai specs. Spec berupa
+        nama tabel (seluruh tabel) atau tuple (tabel, kolom, nilai) seperti view().
+        Yang belum ada di cache diambil paralel, jadi latensi view gabungan
+        setara tabel paling lambat, bukan jumlah semuanya.
+        """
+        futures = {}
+        cold = [spec for spec in dict.fromkeys(specs) if not self._spec_warm(spec)]
+        if len(cold) > 1:
+            futures = {spec: self._executor.submit(self._resolve, spec) for spec in cold}
+        snaps = [futures[spec].result() if spec in futures else self._resolve(spec) for spec in specs]
+        if has_request_context() and snaps:
+            g.grist_age = max(g.get("grist_age", 0), *(snap.age for snap in snaps))
+        return snaps
+
+    def _spec_warm(self, spec):
+        if isinstance(spec, str):
+            return self.is_warm(spec)
+        return self.is_warm(spec[0]) or self.is_warm(spec)
+
+    def _resolve(self, spec):
+        snap = self.snapshot(spec) if isinstance(spec, str) else self.view(*spec)
+        if snap.rows:
+            # Metadata kolom ikut diambil di thread yang sama
+            self.schema(snap)
+        return snap
+
+    def view_version(self, table_name, column, value, snap=None):
+        """
+        Versi data untuk view column == value. Dari snapshot penuh, versi hanya
+        berubah kalau tabel diganti penuh atau patch webhook menyentuh nilai ini,
+        jadi cache response branch lain tetap valid.
+        """
+        if snap is None:
+            snap = self.view(table_name, column, value)
+        if snap.table != table_name:
+            return snap.table, snap.version
+        with self._lock:
+            patched = self._patched.get((table_name, column, value), 0)
+        return table_name, snap.base_version, patched
+
+    def patch(self, table_name, records):
+        """
+        Terapkan baris dari webhook Grist ke snapshot penuh yang ada di memori.
+        Kembalikan False kalau tidak bisa (belum ada snapshot, kolom tidak
+        lengkap); pemanggil sebaiknya invalidate.
+        """
+        with self._table_lock(table_name):
+            with self._lock:
+                current = self._snapshots.get(table_name)
+            if current is None or not current.rows:
+                return False
+
+            Record = type(current.rows[0])  # pylint: disable=invalid-name
+            rows = {row.id: row for row in current.rows}
+            touched = []
+            for record in records:
+                old = rows.get(record.get("id"))
+                values = []
+                for field in Record._fields:
+                    if field in record:
+                        values.append(record[field])
+                    elif old is not None or field == "manualSort":
+                        values.append(getattr(old, field, None))
+                    else:
+                        return False
+                new = Record._make(values)
+                rows[new.id] = new
+                touched.extend(row for row in (old, new) if row is not None)
+
+            self._store(table_name, list(rows.values()), base_version=current.base_version)
+            # Snapshot yang sudah di-patch ada di store; proses lain memuatnya dari sana
+            self._broadcast(table_name)
+            with self._lock:
+                for row in touched:
+                    for column, value in zip(row._fields, row):
+                        try:
+                            key = (table_name, column, value)
+                            self._patched[key] = self._patched.get(key, 0) + 1
+                        except TypeError:
+                            # Nilai list (RefList) tidak bisa jadi key
+                            continue
+            return True
+
+    def schema(self, snap):
+        return self.schemas.get(table_of(snap.table), type(snap.rows[0]) if snap.rows else None)
+
+    def records(self, table_name, snap=None):
+        if snap is None:
+            snap = self.snapshot(table_name)
+        if not snap.rows:
+            return []
+        return snap.records(self.schema(snap))
+
+    def index(self, table_name, column, snap=None):
+        if snap is None:
+            snap = self.snapshot(table_name)
+        if not snap.rows:
+            return {}
+        return snap.index(self.schema(snap), column)
+
+    def page(self, table_name, after=None, limit=100):
+        """
+        Satu halaman records urut row id, mulai setelah row id after.
+        Kembalikan (records, row id terakhir kalau masih ada halaman berikutnya, total).
+        """
+        snap = self.snapshot(table_name)
+        if not snap.rows:
+            return [], None, 0
+        ids, records = snap.ordered(self.schema(snap))
+        start = bisect_right(ids, after) if after is not None else 0
+        end = start + limit
+        return records[start:end], ids[end - 1] if end < len(ids) else None, len(ids)
+
+    def lookup(self, table_name, column, value, snap=None):
+        """Records dengan column == value; snap dari fetch_many/view kalau sudah diambil."""
+        if snap is None:
+            snap = self.view(table_name, column, value)
+        if not snap.rows:
+            return []
+        if snap.table != table_name:
+            # Partisi sudah difilter oleh Grist
+            return snap.records(self.schema(snap))
+        return snap.index(self.schema(snap), column).get(value, [])
+
+    def refresh(self, key):
+        if not isinstance(key, str):
+            table_name, column, value = key
+            rows = self._api.fetch_table(table_name, filters={grist_column(column): value})
+            # Partisi kosong juga disimpan (negative cache) dengan TTL yang sama,
+            # supaya nilai yang tidak ada tidak ditanyakan ke Grist setiap request
+            return self._store(key, rows)
+
+        if self._sync is None:
+            return self._store(key, self._api.fetch_table(key))
+
+        with self._lock:
+            current = self._snapshots.get(key)
+        rows, changed = self._sync.sync(key, current.rows if current else None)
+        if current is not None and not changed:
+            with self._lock:
+                current.fetched_at = time.time()
+                current.from_disk = False
+                self.refreshes += 1
+            if self._persist is not None:
+                try:
+                    self._persist.touch(key, current.fetched_at)
+                except Exception as e:
+                    print(f"Error touching Grist snapshot {key}: {e}")
+            return current
+        return self._store(key, rows)
+
+    def digests(self, tables):
+        """Digest isi snapshot penuh tiap tabel (None kalau belum ada/tidak disimpan)."""
+        with self._lock:
+            return [getattr(self._snapshots.get(table), "digest", None) for table in tables]
+
+    def published_view(self, view_key, tables):
+        """Body view yang dipublikasikan warmer untuk data yang sama, atau None."""
+        sources = self.digests(tables)
+        if self._persist is None or None in sources:
+            return None
+        try:
+            return self._persist.load_view(view_key, sources)
+        except Exception as e:
+            print(f"Error loading published view {view_key}: {e}")
+            return None
+
+    def publish_view(self, view_key, tables, body):
+        sources = self.digests(tables)
+        if self._persist is None or None in sources:
+            return False
+        self._persist.save_view(view_key, sources, body)
+        return True
+
+    def invalidate(self, table_name=None, records=None):
+        """
+        Buang snapshot. Kalau records diberikan, hanya partisi yang nilainya
+        cocok dengan salah satu record yang dibuang (snapshot penuh tetap dibuang).
+        """
+        if table_name is not None:
+            # Snapshot di disk ikut kedaluwarsa supaya proses lain mengambil ulang dari Grist
+            self._broadcast(table_name, expire=True)
+        with self._lock:
+            if table_name is None:
+                self._snapshots.clear()
+                return
+            for key in [key for key in self._snapshots if table_of(key) == table_name]:
+                if records is not None and not isinstance(key, str):
+                    _, column, value = key
+                    if not any(record.get(grist_column(column)) == value for record in records):
+                        continue
+                if isinstance(key, str):
+                    del self._snapshots[key]
+                else:
+                    self._drop_partition(key)
+
+    def stats(self):
+        with self._lock:
+            tables = {}
+            partitions = {}
+            for key, snap in self._snapshots.items():
+                if isinstance(key, str):
+                    tables[key] = {
+                        "rows": len(snap.rows),
+                        "age": round(snap.age, 3),
+                        "ttl": self.ttl_for(key),
+                        "version": snap.version,
+                        "fromDisk": snap.from_disk,
+                    }
+                else:
+                    partitions[key[0]] = partitions.get(key[0], 0) + 1
+            return {
+                "hits": self.hits,
+                "staleHits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "refreshErrors": self.refresh_errors,
+                "remoteInvalidations": self.remote_invalidations,
+                "tables": tables,
+                "partitions": partitions,
+                "schemas": self.schemas.stats(),
+                "sync": self._sync.stats() if self._sync else None,
+            }
+
+    def _store(self, key, rows, fetched_at=None, digest=None, persist=True, base_version=None):
+        with self._lock:
+            version = next(self._version_seq)
+            snap = TableSnapshot(
+                key, rows, fetched_at=fetched_at, version=version, digest=digest, base_version=base_version
+            )
+            self._snapshots[key] = snap
+            self.refreshes += 1
+            if isinstance(key, str):
+                if base_version is None:
+                    # Isi tabel diganti penuh, penanda patch lama tidak relevan lagi
+                    for patched in [k for k in self._patched if k[0] == key]:
+                        del self._patched[patched]
+                # Snapshot penuh sudah ada, partisi tabel ini tidak diperlukan lagi
+                for partition in [k for k in self._partitions if k[0] == key]:
+                    self._drop_partition(partition)
+            else:
+                self._partitions[key] = None
+                self._partitions.move_to_end(key)
+                while len(self._partitions) > self.max_partitions:
+                    self._drop_partition(next(iter(self._partitions)))
+        if persist and self._persist is not None and isinstance(key, str):
+            try:
+                snap.digest = self._persist.save(key, rows, snap.fetched_at)
+            except Exception as e:
+                print(f"Error saving Grist snapshot {key}: {e}")
+        return snap
+
+    def _broadcast(self, table_name, expire=False):
+        """Naikkan generasi tabel di store supaya worker lain membuang snapshot-nya."""
+        if self._persist is None:
+            return
+        try:
+            generation = self._persist.bump(table_name, expire)
+        except Exception as e:
+            print(f"Error broadcasting Grist change {table_name}: {e}")
+            return
+        with self._lock:
+            # Perubahan dari proses ini sendiri tidak perlu diterapkan ulang
+            if self._generations is not None and self._generations.get(table_name, 0) == generation - 1:
+                self._generations[table_name] = generation
+
+    def _check_generations(self):
+        if self._persist is None:
+            return
+        now = time.time()
+        with self._lock:
+            if now - self._generations_checked < self.generation_interval:
+                return
+            self._generations_checked = now
+        try:
+            generations = self._persist.generations()
+        except Exception as e:
+            print(f"Error reading Grist generations: {e}")
+            return
+        with self._lock:
+            if self._generations is None:
+                self._generations = generations
+                return
+            changed = [table for table, generation in generations.items() if self._generations.get(table) != generation]
+            self._generations.update(generations)
+            for key, snap in self._snapshots.items():
+                if table_of(key) in changed:
+                    # Kedaluwarsa, bukan dibuang: request berikutnya mengambil ulang
+                    # secara sinkron, dan snapshot lama tetap dilayani kalau Grist gagal
+                    snap.fetched_at = 0
+                    snap.from_disk = False
+            self.remote_invalidations += len(changed)
+
+    def _drop_partition(self, key):
+        # Dipanggil dengan self._lock dipegang
+        self._partitions.pop(key, None)
+        self._snapshots.pop(key, None)
+        self._table_locks.pop(key, None)
+
+    def _table_lock(self, key):
+        with self._lock:
+            lock = self._table_locks.get(key)
+            if lock is None:
+                lock = self._table_locks[key] = threading.Lock()
+            return lock
+
+    def _pull_shared_locked(self, key):
+        if self._persist is None:
+            return None
+        with self._table_lock(key):
+            with self._lock:
+                current = self._snapshots.get(key)
+            return self._pull_shared(key, current)
+
+    def _revalidate(self, key, current):
+        return self._pull_shared(key, current) or self.refresh(key)
+
+    def _pull_shared(self, key, current):
+        """Pakai snapshot di disk kalau proses lain sudah menyegarkannya."""
+        if self._persist is None or not isinstance(key, str):
+            return None
+        try:
+            meta = self._persist.meta(key)
+            if meta is None or time.time() - meta[0] >= self.ttl_for(key):
+                return None
+            fetched_at, digest = meta
+            if current is not None and digest is not None and current.digest == digest:
+                with self._lock:
+                    current.fetched_at = fetched_at
+                    current.from_disk = False
+                return current
+            saved = self._persist.load_table(key)
+        except Exception as e:
+            print(f"Error reading shared Grist snapshot {key}: {e}")
+            return None
+        if saved is None:
+            return None
+        fetched_at, digest, rows = saved
+        if self._sync is not None:
+            # Baris tidak lewat sync engine proses ini, mulai ulang dari fetch penuh
+            self._sync.forget(key)
+        return self._store(key, rows, fetched_at=fetched_at, digest=digest, persist=False)
+
+    def _refresh_locked(self, key, stale=None):
+        # Satu fetch per key; request lain menunggu hasil yang sama
+        with self._table_lock(key):
+            with self._lock:
+                current = self._snapshots.get(key)
+            if current is not None and current is not stale and current.age < self.ttl_for(key):
+                return current
+            try:
+                return self._revalidate(key, current)
+            except Exception as e:
+                with self._lock:
+                    self.refresh_errors += 1
+                if stale is None:
+                    if not isinstance(key, str):
+                        # Partisi yang gagal diambil tidak meninggalkan lock
+                        with self._lock:
+                            if key not in self._partitions:
+                                self._table_locks.pop(key, None)
+                    raise
+                # Grist tidak bisa dihubungi, layani data terakhir yang ada
+                print(f"Error refreshing Grist table {key}, serving stale snapshot: {e}")
+                return stale
+
+    def _refresh_in_background(self, key):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def worker():
+            try:
+                with self._table_lock(key):
+                    with self._lock:
+                        current = self._snapshots.get(key)
+                    self._revalidate(key, current)
+            except Exception as e:
+                with self._lock:
+                    self.refresh_errors += 1
+                print(f"Error refreshing Grist table {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=worker, daemon=True).start()
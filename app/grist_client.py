@@ -0,0 +1,113 @@
+import json
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from grist_api import GristDocAPI
+
+
+class PooledGristDocAPI(GristDocAPI):
+    """
+    GristDocAPI dengan satu requests.Session bersama.
+
+    grist_api memanggil requests.request() untuk setiap call, jadi tiap fetch
+    bisa membuka koneksi (dan handshake TLS) baru. Di sini koneksi dipakai
+    ulang lewat pool urllib3, dengan timeout connect/read yang jelas dan retry
+    untuk error koneksi serta 502/503/504 pada GET.
+    """
+
+    def __init__(self, doc_id, api_key=None, server='https://api.getgrist.com', dryrun=False,
+                 verify_ssl=True, pool_size=10, connect_timeout=3.05, read_timeout=30, retries=3):
+        super().__init__(doc_id, api_key=api_key, server=server, dryrun=dryrun, verify_ssl=verify_ssl)
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_size = pool_size
+        self._session = requests.Session()
+        self._session.headers.update({
+            'Authorization': 'Bearer %s' % self._api_key,
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+        })
+        # POST (add_records) tidak idempoten, jadi hanya diulang kalau koneksi gagal dibuat
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            raise_on_status=False,
+        )
+        self._adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.pool_size, max_retries=retry, pool_block=False)
+        self._session.mount('https://', self._adapter)
+        self._session.mount('http://', self._adapter)
+
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.busy_retries = 0
+
+    def call(self, url, json_data=None, method=None, prefix=None):
+        if prefix is None:
+            prefix = '/api/docs/%s/' % self._doc_id
+        data = json.dumps(json_data, sort_keys=True).encode('utf8') if json_data is not None else None
+        method = method or ('POST' if data else 'GET')
+
+        while True:
+            full_url = self._server + prefix + url
+            if self._dryrun and method != 'GET':
+                print(f"DRYRUN NOT sending {method} request to {full_url}")
+                return None
+            with self._lock:
+                self.calls += 1
+            try:
+                resp = self._session.request(method, full_url, data=data, timeout=self.timeout, verify=self._verify_ssl)
+            except requests.exceptions.RequestException:
+                with self._lock:
+                    self.errors += 1
+                raise
+            if not resp.ok:
+                err_msg = None
+                try:
+                    error_obj = resp.json()
+                    if error_obj and isinstance(error_obj.get("error"), str):
+                        err_msg = error_obj.get("error")
+                        # SQLITE_BUSY di Grist bersifat sementara dan aman diulang
+                        if 'SQLITE_BUSY' in err_msg:
+                            with self._lock:
+                                self.busy_retries += 1
+                            time.sleep(2)
+                            continue
+                except Exception:  # pylint: disable=broad-except
+                    pass
+
+                with self._lock:
+                    self.errors += 1
+                if err_msg:
+                    raise requests.HTTPError(err_msg, response=resp)
+                resp.raise_for_status()
+            return resp
+
+    def http_stats(self):
+        """Statistik pool: jumlah request vs koneksi baru yang dibuka (sisanya reuse)."""
+        connections = 0
+        requests_sent = 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections += pool.num_connections
+            requests_sent += pool.num_requests
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "errors": self.errors,
+                "busyRetries": self.busy_retries,
+                "requests": requests_sent,
+                "connectionsOpened": connections,
+                "connectionsReused": max(requests_sent - connections, 0),
+                "poolSize": self.pool_size,
+                "timeout": list(self.timeout),
+            }
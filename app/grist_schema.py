@@ -0,0 +1,129 @@
+import threading
+import time
+from operator import attrgetter
+import requests
+
+# Nama kolom bawaan Grist -> nama field di response API kita
+ALIASES = {"id": "ID", "manualSort": "RowID"}
+BUILTIN_COLUMNS = ("id", "manualSort")
+HELPER_PREFIX = "gristHelper_"
+
+
+def grist_column(key):
+    """Nama kolom Grist untuk field response (mis. ID -> id)."""
+    for column, alias in ALIASES.items():
+        if alias == key:
+            return column
+    return key
+
+
+class TableSchema:
+    """
+    Daftar kolom satu tabel Grist, diambil dari metadata kolom.
+
+    Baris dari fetch_table (namedtuple) dipetakan ke dict berdasarkan nama
+    kolom, bukan posisi, jadi urutan kolom di Grist tidak berpengaruh.
+    """
+
+    __slots__ = ("table", "columns", "types", "keys", "_bound")
+
+    def __init__(self, table, columns, types=None):
+        self.table = table
+        self.columns = BUILTIN_COLUMNS + tuple(
+            column for column in columns
+            if column not in BUILTIN_COLUMNS and not column.startswith(HELPER_PREFIX)
+        )
+        self.types = types or {}
+        self.keys = tuple(ALIASES.get(column, column) for column in self.columns)
+        self._bound = {}
+
+    def bind(self, record_type):
+        """Keys dan getter untuk tipe baris tertentu, dibuat sekali per tipe."""
+        # fetch_table membuat namedtuple baru tiap panggilan, jadi pakai _fields sebagai key
+        bound = self._bound.get(record_type._fields)
+        if bound is None:
+            fields = set(record_type._fields)
+            columns = [column for column in self.columns if column in fields]
+            keys = tuple(ALIASES.get(column, column) for column in columns)
+            if len(columns) == 1:
+                getter = (lambda get: lambda row: (get(row),))(attrgetter(columns[0]))
+            elif columns:
+                getter = attrgetter(*columns)
+            else:
+                getter = lambda row: ()
+            bound = self._bound[record_type._fields] = (keys, getter)
+        return bound
+
+    def to_records(self, rows):
+        if not rows:
+            return []
+        keys, getter = self.bind(type(rows[0]))
+        return [dict(zip(keys, getter(row))) for row in rows]
+
+
+class SchemaRegistry:
+    """
+    Cache TableSchema per tabel; metadata kolom hanya diambil sekali.
+
+    Kalau metadata gagal diambil, schema dari nama kolom data dipakai dan
+    disimpan selama retry_after detik, supaya saat Grist down setiap request
+    tidak menunggu /columns lagi dan snapshot tidak membuat salinan records
+    baru untuk setiap objek schema.
+    """
+
+    def __init__(self, api, retry_after=60):
+        self._api = api
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._schemas = {}
+        self._fallbacks = {}
+
+    def get(self, table_name, record_type=None):
+        with self._lock:
+            schema = self._schemas.get(table_name)
+            fallback = self._fallbacks.get(table_name)
+        if schema is not None:
+            return schema
+        if fallback is not None and record_type is not None:
+            fallback_schema, fields, retry_at = fallback
+            if time.time() < retry_at and fields == record_type._fields:
+                return fallback_schema
+
+        try:
+            columns = self._api.columns(table_name).json()["columns"]
+            schema = TableSchema(
+                table_name,
+                [column["id"] for column in columns],
+                {column["id"]: column.get("fields", {}).get("type") for column in columns},
+            )
+        except (requests.exceptions.RequestException, KeyError, TypeError, ValueError) as e:
+            if record_type is None:
+                raise
+            # Metadata tidak bisa diambil, pakai nama kolom dari data
+            print(f"Error loading Grist columns for {table_name}: {e}")
+            if fallback is not None and fallback[1] == record_type._fields:
+                # Objek yang sama dipakai lagi supaya cache records snapshot tidak digandakan
+                schema = fallback[0]
+            else:
+                schema = TableSchema(table_name, record_type._fields)
+            with self._lock:
+                self._fallbacks[table_name] = (schema, record_type._fields, time.time() + self.retry_after)
+            return schema
+
+        with self._lock:
+            self._schemas[table_name] = schema
+            self._fallbacks.pop(table_name, None)
+        return schema
+
+    def reload(self, table_name=None):
+        with self._lock:
+            if table_name is None:
+                self._schemas.clear()
+                self._fallbacks.clear()
+            else:
+                self._schemas.pop(table_name, None)
+                self._fallbacks.pop(table_name, None)
+
+    def stats(self):
+        with self._lock:
+            return {name: list(schema.keys) for name, schema in self._schemas.items()}
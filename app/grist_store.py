@@ -0,0 +1,150 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+
+class SnapshotStore:
+    """
+    Penyimpanan snapshot tabel Grist di file SQLite lokal.
+
+    Dipakai supaya worker yang baru start (atau saat Grist tidak bisa
+    dihubungi) tetap bisa melayani katalog dari data terakhir yang diketahui.
+    Satu baris per tabel: nama kolom dan isi baris disimpan sebagai JSON,
+    plus digest isi supaya proses lain bisa tahu apakah datanya berubah.
+
+    File yang sama juga jadi cache bersama antar worker: catalog warmer
+    (Celery beat) menulis snapshot dan view per branch, web worker membacanya.
+    Tabel generations berisi penghitung per tabel yang dinaikkan saat webhook
+    mengubah data, supaya worker lain membuang snapshot di memorinya.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                " table_name TEXT PRIMARY KEY,"
+                " fetched_at REAL NOT NULL,"
+                " columns TEXT NOT NULL,"
+                " rows TEXT NOT NULL)"
+            )
+            columns = [column[1] for column in conn.execute("PRAGMA table_info(snapshots)")]
+            if "digest" not in columns:
+                conn.execute("ALTER TABLE snapshots ADD COLUMN digest TEXT")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS views ("
+                " view_key TEXT PRIMARY KEY,"
+                " sources TEXT NOT NULL,"
+                " body BLOB NOT NULL,"
+                " built_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS generations ("
+                " table_name TEXT PRIMARY KEY,"
+                " generation INTEGER NOT NULL)"
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def save(self, table_name, rows, fetched_at=None):
+        """Simpan snapshot tabel dan kembalikan digest isinya."""
+        columns = json.dumps(list(rows[0]._fields) if rows else [])
+        payload = json.dumps([list(row) for row in rows], separators=(",", ":"))
+        digest = hashlib.sha1((columns + payload).encode("utf8")).hexdigest()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots (table_name, fetched_at, columns, rows, digest)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (table_name, fetched_at or time.time(), columns, payload, digest),
+            )
+        return digest
+
+    def touch(self, table_name, fetched_at=None):
+        """Tandai snapshot di disk masih segar tanpa menulis ulang isinya."""
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE snapshots SET fetched_at = ? WHERE table_name = ?",
+                (fetched_at or time.time(), table_name),
+            )
+
+    def bump(self, table_name, expire=False):
+        """
+        Naikkan generasi tabel dan kembalikan nilainya. expire=True juga
+        menandai snapshot di disk kedaluwarsa (datanya sudah tidak berlaku).
+        """
+        with self._lock, self._connect() as conn:
+            if expire:
+                conn.execute("UPDATE snapshots SET fetched_at = 0 WHERE table_name = ?", (table_name,))
+            conn.execute(
+                "INSERT INTO generations (table_name, generation) VALUES (?, 1)"
+                " ON CONFLICT(table_name) DO UPDATE SET generation = generation + 1",
+                (table_name,),
+            )
+            return conn.execute(
+                "SELECT generation FROM generations WHERE table_name = ?", (table_name,)
+            ).fetchone()[0]
+
+    def generations(self):
+        """{table_name: generation} untuk semua tabel yang pernah di-bump."""
+        with self._lock, self._connect() as conn:
+            return dict(conn.execute("SELECT table_name, generation FROM generations").fetchall())
+
+    def meta(self, table_name):
+        """(fetched_at, digest) snapshot di disk, atau None."""
+        with self._lock, self._connect() as conn:
+            return conn.execute(
+                "SELECT fetched_at, digest FROM snapshots WHERE table_name = ?", (table_name,)
+            ).fetchone()
+
+    def load_table(self, table_name):
+        """(fetched_at, digest, rows) satu tabel, atau None."""
+        with self._lock, self._connect() as conn:
+            saved = conn.execute(
+                "SELECT fetched_at, digest, columns, rows FROM snapshots WHERE table_name = ?",
+                (table_name,),
+            ).fetchone()
+        if saved is None:
+            return None
+        fetched_at, digest, columns, rows = saved
+        return fetched_at, digest, self._rows(table_name, columns, rows)
+
+    def load(self):
+        """Kembalikan list (table_name, fetched_at, digest, rows) dari file."""
+        with self._lock, self._connect() as conn:
+            saved = conn.execute(
+                "SELECT table_name, fetched_at, digest, columns, rows FROM snapshots"
+            ).fetchall()
+        return [
+            (table_name, fetched_at, digest, self._rows(table_name, columns, rows))
+            for table_name, fetched_at, digest, columns, rows in saved
+        ]
+
+    def save_view(self, view_key, sources, body):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO views (view_key, sources, body, built_at) VALUES (?, ?, ?, ?)",
+                (view_key, json.dumps(sources), body, time.time()),
+            )
+
+    def load_view(self, view_key, sources):
+        """Body view yang dibangun dari sumber (digest) yang sama persis, atau None."""
+        with self._lock, self._connect() as conn:
+            saved = conn.execute(
+                "SELECT sources, body FROM views WHERE view_key = ?", (view_key,)
+            ).fetchone()
+        if saved is None or json.loads(saved[0]) != sources:
+            return None
+        return bytes(saved[1])
+
+    def _rows(self, table_name, columns, rows):
+        columns = json.loads(columns)
+        if not columns:
+            return []
+        Record = namedtuple(table_name, columns)  # pylint: disable=invalid-name
+        return [Record._make(row) for row in json.loads(rows)]
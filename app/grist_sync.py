@@ -0,0 +1,143 @@
+import json
+import time
+from urllib.parse import quote_plus
+import requests
+
+# Jumlah row id per request /data?filter= supaya URL tidak terlalu panjang
+ID_CHUNK_SIZE = 200
+
+
+class SyncState:
+    __slots__ = ("record_type", "high_water_mark", "reconciled_at")
+
+    def __init__(self, record_type, high_water_mark, reconciled_at):
+        self.record_type = record_type
+        self.high_water_mark = high_water_mark
+        self.reconciled_at = reconciled_at
+
+
+class GristSyncEngine:
+    """
+    Sinkronisasi inkremental tabel Grist berdasarkan kolom UpdatedAt.
+
+    Sinkron pertama mengambil seluruh tabel. Berikutnya hanya baris dengan
+    UpdatedAt >= high-water mark yang dicari lewat endpoint SQL Grist, lalu
+    barisnya diambil lewat /data (encoding nilai sama dengan fetch penuh:
+    bool, list) dan digabung ke salinan lokal. Baris yang dihapus di Grist dibersihkan lewat
+    diff daftar row id setiap reconcile_interval detik. Kalau tabel tidak punya
+    kolom timestamp atau query SQL gagal, kembali ke fetch penuh.
+    """
+
+    def __init__(self, api, timestamp_column="UpdatedAt", reconcile_interval=300):
+        self._api = api
+        self.timestamp_column = timestamp_column
+        self.reconcile_interval = reconcile_interval
+        self._state = {}
+
+        self.full_syncs = 0
+        self.delta_syncs = 0
+        self.delta_rows = 0
+        self.deleted_rows = 0
+
+    def sync(self, table_name, rows=None):
+        """Kembalikan (rows, changed) untuk tabel yang diminta."""
+        state = self._state.get(table_name)
+        if rows is None or state is None:
+            return self.full_sync(table_name), True
+
+        try:
+            changed = self._fetch_changed(table_name, state)
+            live_ids = None
+            if time.time() - state.reconciled_at >= self.reconcile_interval:
+                live_ids = self._fetch_row_ids(table_name)
+        except (requests.exceptions.RequestException, KeyError, TypeError, ValueError) as e:
+            print(f"Delta sync {table_name} gagal, fetch penuh: {e}")
+            return self.full_sync(table_name), True
+
+        self.delta_syncs += 1
+        merged = {row.id: row for row in rows}
+        modified = False
+        for row in changed:
+            if merged.get(row.id) != row:
+                merged[row.id] = row
+                modified = True
+        self.delta_rows += len(changed)
+
+        if live_ids is not None:
+            state.reconciled_at = time.time()
+            for row_id in [row_id for row_id in merged if row_id not in live_ids]:
+                del merged[row_id]
+                self.deleted_rows += 1
+                modified = True
+
+        if not modified:
+            return rows, False
+
+        new_rows = list(merged.values())
+        state.high_water_mark = self._high_water_mark(new_rows)
+        return new_rows, True
+
+    def full_sync(self, table_name):
+        rows = self._api.fetch_table(table_name)
+        self.full_syncs += 1
+        if rows and self.timestamp_column in rows[0]._fields:
+            self._state[table_name] = SyncState(type(rows[0]), self._high_water_mark(rows), time.time())
+        else:
+            # Tanpa kolom timestamp (atau tabel kosong) tidak bisa delta
+            self._state.pop(table_name, None)
+        return rows
+
+    def forget(self, table_name=None):
+        if table_name is None:
+            self._state.clear()
+        else:
+            self._state.pop(table_name, None)
+
+    def stats(self):
+        return {
+            "fullSyncs": self.full_syncs,
+            "deltaSyncs": self.delta_syncs,
+            "deltaRows": self.delta_rows,
+            "deletedRows": self.deleted_rows,
+            "highWaterMarks": {
+                name: state.high_water_mark for name, state in self._state.items()
+            },
+        }
+
+    def _high_water_mark(self, rows):
+        values = [getattr(row, self.timestamp_column) for row in rows]
+        values = [value for value in values if isinstance(value, (int, float))]
+        return max(values) if values else None
+
+    def _sql(self, sql, args=None):
+        resp = self._api.call('sql', json_data={"sql": sql, "args": args or []})
+        return [record["fields"] for record in resp.json()["records"]]
+
+    def _fetch_changed(self, table_name, state):
+        if state.high_water_mark is None:
+            raise ValueError("high-water mark kosong")
+        # SQL hanya untuk mencari id; nilainya mentah SQLite (0/1, list sebagai string JSON)
+        # Pakai >= supaya baris dengan timestamp sama dengan mark tidak terlewat
+        ids = [
+            record["id"] for record in self._sql(
+                f'SELECT id FROM "{table_name}" WHERE "{self.timestamp_column}" >= ?',
+                [state.high_water_mark],
+            )
+        ]
+        return self._fetch_rows(table_name, state.record_type, ids)
+
+    def _fetch_rows(self, table_name, record_type, ids):
+        """Baris dengan row id tertentu lewat /data, dengan tipe baris yang sama dengan snapshot."""
+        fields = record_type._fields
+        rows = []
+        for start in range(0, len(ids), ID_CHUNK_SIZE):
+            query = quote_plus(json.dumps({"id": ids[start:start + ID_CHUNK_SIZE]}))
+            columns = self._api.call(f'tables/{table_name}/data?filter={query}').json()
+            rows.extend(
+                record_type._make(columns[field][index] for field in fields)
+                for index in range(len(columns["id"]))
+            )
+        return rows
+
+    def _fetch_row_ids(self, table_name):
+        return {record["id"] for record in self._sql(f'SELECT id FROM "{table_name}"')}
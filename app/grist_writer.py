@@ -0,0 +1,152 @@
+import uuid
+from datetime import datetime, timedelta
+from app.celery_app import celery
+from app.grist_batch import add_records_batch, invalid_item
+
+# Job "processing" yang tidak selesai dalam waktu ini dianggap worker-nya mati
+STALE_CLAIM = timedelta(minutes=5)
+
+# Status item yang tidak diproses lagi oleh flush:
+# created, invalid (data tidak lengkap), failed (ditolak Grist),
+# unknown (timeout, baris mungkin sudah tersimpan; perlu dicek manual)
+FINAL_ITEM_STATUSES = ("created", "invalid", "failed", "unknown")
+# Jenis error add_records yang aman diulang (request tidak menulis apa pun)
+RETRYABLE_ERRORS = ("connection", "server")
+
+
+def enqueue_grist_write(app, table_name, key_column, records, validate=True):
+    """
+    Simpan tulisan ke antrean (koleksi grist_write_jobs) dan jadwalkan flush.
+    Kembalikan job id (statusnya bisa dilihat lewat /grist_write/<jobId>),
+    atau None kalau MongoDB tidak tersedia sehingga pemanggil harus menulis langsung.
+    validate=False untuk record tunggal yang dulu langsung diteruskan ke add_records
+    tanpa cek key_column/url.
+    """
+    db = app.config['db']
+    if db is None:
+        return None
+    now = datetime.utcnow()
+    try:
+        job_id = db.grist_write_jobs.insert_one({
+            "table": table_name,
+            "keyColumn": key_column,
+            "validate": validate,
+            "status": "queued",
+            "attempts": 0,
+            "items": [{"record": dict(record), "status": "queued"} for record in records],
+            "nextAttemptAt": now,
+            "createdAt": now,
+            "updatedAt": now,
+        }).inserted_id
+    except Exception as e:
+        print(f"Error enqueue Grist write {table_name}: {e}")
+        return None
+
+    try:
+        # Tulisan yang masuk selama jeda ini digabung dalam satu flush
+        flush_grist_writes.apply_async(countdown=app.config['GRIST_WRITE_FLUSH_DELAY'])
+    except Exception as e:
+        # Broker tidak bisa dihubungi; job tetap diambil flush berkala dari beat
+        print(f"Error scheduling flush_grist_writes: {e}")
+    return str(job_id)
+
+
+def job_status(items):
+    created = sum(1 for item in items if item["status"] == "created")
+    if created == len(items):
+        return "done"
+    if any(item["status"] == "unknown" for item in items):
+        # Tidak diulang otomatis supaya tidak ada baris ganda
+        return "review"
+    return "partial" if created else "failed"
+
+
+def item_status(result):
+    """Status item antrean dari hasil add_records_batch."""
+    if result["status"] == "created":
+        return "created"
+    error_type = result.get("errorType")
+    if error_type in RETRYABLE_ERRORS:
+        return "error"
+    if error_type == "timeout":
+        return "unknown"
+    return "invalid" if error_type == "validation" else "failed"
+
+
+@celery.task
+def flush_grist_writes():
+    try:
+        app = celery.app
+        if app is None:
+            print("Flask app is not attached to Celery!")
+            return
+        with app.app_context():
+            api = app.api
+            collection = app.config['db'].grist_write_jobs
+            now = datetime.utcnow()
+
+            collection.update_many(
+                {"status": "processing", "updatedAt": {"$lt": now - STALE_CLAIM}},
+                {"$set": {"status": "queued", "updatedAt": now}},
+            )
+
+            # Klaim semua job yang jatuh tempo; flush lain yang jalan bersamaan tidak ikut menulisnya
+            claim = uuid.uuid4().hex
+            collection.update_many(
+                {"status": "queued", "nextAttemptAt": {"$lte": now}},
+                {"$set": {"status": "processing", "claim": claim, "updatedAt": now}},
+            )
+            jobs = list(collection.find({"claim": claim, "status": "processing"}))
+            if not jobs:
+                return {"jobs": 0}
+
+            # Gabungkan item yang belum masuk dari semua job per tabel
+            pending = {}
+            for job in jobs:
+                validate = job.get("validate", True)
+                for item in job["items"]:
+                    if item["status"] in FINAL_ITEM_STATUSES:
+                        continue
+                    error = invalid_item(item["record"], job["keyColumn"]) if validate else None
+                    if error:
+                        # Data tidak valid tidak akan berhasil walau diulang
+                        item.update(status="invalid", error=error)
+                        continue
+                    pending.setdefault((job["table"], job["keyColumn"], validate), []).append(item)
+
+            for (table_name, key_column, validate), items in pending.items():
+                results = add_records_batch(
+                    api, table_name, [item["record"] for item in items], key_column,
+                    app.config['GRIST_BATCH_CHUNK_SIZE'], validate=validate,
+                )
+                for item, result in zip(items, results):
+                    item["status"] = item_status(result)
+                    if result["status"] == "created":
+                        item["id"] = result["id"]
+                        item.pop("error", None)
+                    else:
+                        item["error"] = result["error"]
+
+            max_attempts = app.config['GRIST_WRITE_MAX_ATTEMPTS']
+            retry_in = None
+            for job in jobs:
+                attempts = job["attempts"] + 1
+                status = job_status(job["items"])
+                update = {"items": job["items"], "attempts": attempts, "updatedAt": datetime.utcnow()}
+                # Hanya error yang pasti belum menulis ke Grist yang diulang
+                retryable = any(item["status"] == "error" for item in job["items"])
+                if retryable and attempts < max_attempts:
+                    # Backoff eksponensial: 2, 4, 8, ... detik
+                    delay = 2 ** attempts
+                    update.update(status="queued", nextAttemptAt=now + timedelta(seconds=delay))
+                    retry_in = delay if retry_in is None else min(retry_in, delay)
+                else:
+                    update["status"] = status
+                collection.update_one({"_id": job["_id"]}, {"$set": update, "$unset": {"claim": ""}})
+
+            if retry_in is not None:
+                flush_grist_writes.apply_async(countdown=retry_in)
+            print(f"Flushed {len(jobs)} Grist write jobs")
+            return {"jobs": len(jobs), "retryIn": retry_in}
+    except Exception as e:
+        print(f"Error in flush_grist_writes: {e}")
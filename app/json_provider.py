@@ -0,0 +1,68 @@
+from datetime import date, datetime
+from decimal import Decimal
+from bson import ObjectId, Decimal128
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # tanpa orjson tetap pakai encoder bawaan Flask
+    orjson = None
+
+if orjson is not None:
+    # datetime naive dari MongoDB adalah UTC -> "....Z", sama dengan isoformat() + 'Z'
+    ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+
+def encode_value(o):
+    """Tipe yang tidak dikenal encoder JSON: ObjectId, Decimal/Decimal128, datetime, namedtuple."""
+    if isinstance(o, ObjectId):
+        return str(o)
+    if isinstance(o, Decimal128):
+        return str(o.to_decimal())
+    if isinstance(o, Decimal):
+        return str(o)
+    if isinstance(o, datetime):
+        if o.tzinfo is None:
+            return o.isoformat() + 'Z'
+        return o.isoformat()
+    if isinstance(o, date):
+        return o.isoformat()
+    if isinstance(o, tuple):
+        # Baris mentah fetch_table (namedtuple) jadi array, sama seperti encoder bawaan
+        return list(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider berbasis orjson. ObjectId, datetime dan Decimal langsung
+    di-encode, jadi handler boleh mengembalikan nilai dari dokumen MongoDB
+    tanpa str()/isoformat() manual.
+    """
+
+    @staticmethod
+    def default(o):
+        return encode_value(o)
+
+    def dumps(self, obj, **kwargs):
+        if orjson is None or kwargs:
+            kwargs.setdefault("default", self.default)
+            kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+            kwargs.setdefault("sort_keys", self.sort_keys)
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=encode_value, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        # Langsung bytes, tanpa decode/encode ulang
+        return self._app.response_class(
+            orjson.dumps(obj, default=encode_value, option=ORJSON_OPTIONS),
+            mimetype=self.mimetype,
+        )
@@ -0,0 +1,144 @@
+from pymongo import ASCENDING
+from pymongo.errors import PyMongoError
+from app.config import Config
+
+
+def unique_if_present(field):
+    """Unique hanya untuk dokumen yang punya field tersebut (string)."""
+    return {"unique": True, "partialFilterExpression": {field: {"$type": "string"}}}
+
+
+# Index per koleksi: (nama, keys, opsi tambahan untuk create_index)
+INDEXES = {
+    "reservation": [
+        ("branch_date_status", [("branchCode", ASCENDING), ("date", ASCENDING), ("status", ASCENDING)], {}),
+        # Keyset pagination /reservation_branch: filter branchCode, urut (date, time, _id)
+        ("branch_date_time_id", [("branchCode", ASCENDING), ("date", ASCENDING), ("time", ASCENDING), ("_id", ASCENDING)], {}),
+        ("reservationCode", [("reservationCode", ASCENDING)], {}),
+        # Range scan ?from=&to= pada slotAt (UTC), urut (slotAt, _id) untuk keyset pagination
+        ("branch_slotAt_id", [("branchCode", ASCENDING), ("slotAt", ASCENDING), ("_id", ASCENDING)], {}),
+    ],
+    "invoice": [
+        ("invoice_id_unique", [("invoice_id", ASCENDING)], unique_if_present("invoice_id")),
+        ("external_id_unique", [("external_id", ASCENDING)], unique_if_present("external_id")),
+        ("reservationCode", [("reservationCode", ASCENDING)], {}),
+        ("branchCode", [("branchCode", ASCENDING)], {}),
+    ],
+    "customer": [
+        ("phone", [("phone", ASCENDING)], {}),
+    ],
+    "user": [
+        ("phone", [("phone", ASCENDING)], {}),
+    ],
+    "refund": [
+        ("external_id_unique", [("external_id", ASCENDING)], unique_if_present("external_id")),
+        ("branchCode", [("branchCode", ASCENDING)], {}),
+    ],
+    "disbursements": [
+        ("external_id_unique", [("external_id", ASCENDING)], unique_if_present("external_id")),
+    ],
+    "reservation_summary": [
+        ("branch_date", [("branchCode", ASCENDING), ("date", ASCENDING)], {}),
+        ("external_id", [("external_id", ASCENDING)], {}),
+    ],
+    "slot_occupancy": [
+        ("branch_date_time_unique", [("branchCode", ASCENDING), ("date", ASCENDING), ("time", ASCENDING)], {"unique": True}),
+    ],
+    "catalog_warm_runs": [
+        # Satu dokumen per run beat (tiap CATALOG_WARM_INTERVAL detik); dibuang otomatis oleh TTL
+        ("startedAt_ttl", [("startedAt", ASCENDING)], {"expireAfterSeconds": Config.CATALOG_WARM_RUNS_TTL}),
+    ],
+    "grist_write_jobs": [
+        ("status_nextAttemptAt", [("status", ASCENDING), ("nextAttemptAt", ASCENDING)], {}),
+        ("claim", [("claim", ASCENDING)], {"sparse": True}),
+    ],
+}
+
+# Bentuk filter query yang dipakai aplikasi: (koleksi, field yang difilter, dipakai di)
+QUERIES = [
+    ("reservation", ["branchCode"], "/reservation_dashboard, /reservation_branch"),
+    ("reservation", ["branchCode", "date"], "/reservation_branch?date="),
+    ("reservation", ["branchCode", "date", "status"], "/reservation_branch?date=&status="),
+    ("reservation", ["branchCode", "status"], "/reservation_branch?status="),
+    ("reservation", ["branchCode", "date", "time", "_id"], "/reservation_branch?limit=&after="),
+    ("reservation", ["branchCode", "slotAt"], "/reservation_branch?from=&to=, /reservation_dashboard?from=&to="),
+    ("reservation", ["branchCode", "slotAt", "_id"], "/reservation_branch?from=&to=&limit=&after="),
+    ("reservation", ["reservationCode"], "/update_reservation_posted"),
+    ("invoice", ["invoice_id"], "/xendit_webhook, expire_invoice"),
+    ("invoice", ["external_id"], "/invoices/<external_id>, /refund"),
+    ("invoice", ["reservationCode"], "send_whatsapp_reminder"),
+    ("invoice", ["branchCode"], "/invoice/<branchCode>"),
+    ("customer", ["phone"], "/customer, /customer_gro (POST)"),
+    ("user", ["phone"], "/user (POST), /user/login"),
+    ("refund", ["external_id"], "/refund, /refund/<external_id>"),
+    ("refund", ["branchCode"], "/refunds/<branchCode>"),
+    ("disbursements", ["external_id"], "/webhook_disbursement"),
+    ("reservation_summary", ["branchCode"], "/reservation_summary/<branchCode>"),
+    ("reservation_summary", ["branchCode", "date"], "/reservation_summary (POST)"),
+    ("reservation_summary", ["external_id"], "/webhook_disbursement"),
+    ("slot_occupancy", ["branchCode", "date"], "/availability/<BranchCode>"),
+    ("slot_occupancy", ["branchCode", "date", "time"], "sync_occupancy"),
+    ("grist_write_jobs", ["status", "nextAttemptAt"], "flush_grist_writes"),
+    ("grist_write_jobs", ["claim"], "flush_grist_writes"),
+]
+
+
+def ensure_indexes(db):
+    """
+    Buat semua index di INDEXES. Aman dipanggil berulang (create_index
+    idempoten); kegagalan satu index dilaporkan tanpa menghentikan yang lain.
+    Kembalikan list hasil {collection, index, status, error}.
+    """
+    results = []
+    for collection, indexes in INDEXES.items():
+        for name, keys, options in indexes:
+            try:
+                db[collection].create_index(keys, name=name, **options)
+                results.append({"collection": collection, "index": name, "status": "ok"})
+            except PyMongoError as e:
+                print(f"Error creating index {collection}.{name}: {e}")
+                results.append({"collection": collection, "index": name, "status": "error", "error": str(e)})
+    return results
+
+
+def index_coverage(db):
+    """
+    Cocokkan QUERIES dengan index yang benar-benar ada di database.
+    full: semua field filter ada di prefix satu index; partial: hanya
+    sebagian (sisanya difilter setelah index scan); none: collection scan.
+    """
+    existing = {}
+    report = []
+    for collection, fields, used_by in QUERIES:
+        if collection not in existing:
+            try:
+                info = db[collection].index_information()
+            except PyMongoError as e:
+                print(f"Error reading indexes {collection}: {e}")
+                info = {}
+            existing[collection] = {name: [key for key, _ in spec["key"]] for name, spec in info.items()}
+
+        best_name, best_prefix = None, 0
+        for name, keys in existing[collection].items():
+            prefix = 0
+            for key in keys:
+                if key not in fields:
+                    break
+                prefix += 1
+            if prefix > best_prefix:
+                best_name, best_prefix = name, prefix
+
+        if best_prefix == len(fields):
+            coverage = "full"
+        elif best_prefix:
+            coverage = "partial"
+        else:
+            coverage = "none"
+        report.append({
+            "collection": collection,
+            "fields": fields,
+            "usedBy": used_by,
+            "index": best_name,
+            "coverage": coverage,
+        })
+    return report
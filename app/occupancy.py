@@ -0,0 +1,114 @@
+from datetime import datetime
+from app.celery_app import celery
+
+# Status reservasi yang memakai kursi di slot-nya
+HOLDING_STATUSES = ("PENDING", "PAID")
+
+
+def occupancy_of(reservation):
+    """Slot dan jumlah pax yang dipakai reservasi, atau None kalau tidak memakai slot."""
+    if not reservation or reservation.get("status") not in HOLDING_STATUSES:
+        return None
+    branchCode = reservation.get("branchCode")
+    date = reservation.get("date")
+    time = reservation.get("time")
+    if not (branchCode and date and time):
+        return None
+    try:
+        guest = int(reservation.get("guest") or 0)
+    except (TypeError, ValueError):
+        guest = 0
+    return {"branchCode": branchCode, "date": date, "time": time, "guest": guest}
+
+
+def _increment(db, occupancy, sign):
+    db.slot_occupancy.update_one(
+        {"branchCode": occupancy["branchCode"], "date": occupancy["date"], "time": occupancy["time"]},
+        {
+            "$inc": {"pax": sign * occupancy["guest"], "reservations": sign},
+            "$set": {"updatedAt": datetime.utcnow()},
+        },
+        upsert=True,
+    )
+
+
+def sync_occupancy(db, reservation_id, attempts=3):
+    """
+    Samakan counter slot_occupancy dengan keadaan reservasi sekarang.
+
+    Slot yang sudah dihitung disimpan di field occupancy pada reservasi, dan
+    hanya diganti kalau nilainya masih sama dengan yang dibaca. Jadi panggilan
+    berulang atau bersamaan tidak menghitung dua kali.
+    """
+    for _ in range(attempts):
+        reservation = db.reservation.find_one({"_id": reservation_id})
+        if reservation is None:
+            return
+        current = reservation.get("occupancy")
+        wanted = occupancy_of(reservation)
+        if current == wanted:
+            return
+        result = db.reservation.update_one(
+            {"_id": reservation_id, "occupancy": current},
+            {"$set": {"occupancy": wanted}},
+        )
+        if result.modified_count:
+            if current:
+                _increment(db, current, -1)
+            if wanted:
+                _increment(db, wanted, 1)
+            return
+    print(f"Occupancy reservation {reservation_id} belum sinkron setelah {attempts} percobaan")
+
+
+def release_occupancy(db, reservation):
+    """Kembalikan slot reservasi yang sudah dihapus."""
+    if reservation and reservation.get("occupancy"):
+        _increment(db, reservation["occupancy"], -1)
+
+
+def rebuild_occupancy(db, branchCode=None, date=None):
+    """
+    Hitung ulang counter dari data reservasi (backfill reservasi lama atau
+    koreksi drift). Jalankan di luar jam sibuk; tulisan yang terjadi bersamaan
+    bisa membuat hasilnya meleset sampai rebuild berikutnya.
+    """
+    scope = {}
+    if branchCode:
+        scope["branchCode"] = branchCode
+    if date:
+        scope["date"] = date
+
+    totals = {}
+    for reservation in db.reservation.find(scope, {"branchCode": 1, "date": 1, "time": 1, "guest": 1, "status": 1, "occupancy": 1}):
+        wanted = occupancy_of(reservation)
+        if reservation.get("occupancy") != wanted:
+            db.reservation.update_one({"_id": reservation["_id"]}, {"$set": {"occupancy": wanted}})
+        if wanted:
+            key = (wanted["branchCode"], wanted["date"], wanted["time"])
+            pax, count = totals.get(key, (0, 0))
+            totals[key] = (pax + wanted["guest"], count + 1)
+
+    db.slot_occupancy.delete_many(scope)
+    now = datetime.utcnow()
+    if totals:
+        db.slot_occupancy.insert_many([
+            {"branchCode": key[0], "date": key[1], "time": key[2], "pax": pax, "reservations": count, "updatedAt": now}
+            for key, (pax, count) in totals.items()
+        ])
+    return len(totals)
+
+
+@celery.task
+def rebuild_slot_occupancy(branchCode=None, date=None):
+    try:
+        app = celery.app
+        if app is None:
+            print("Flask app is not attached to Celery!")
+            return
+        with app.app_context():
+            slots = rebuild_occupancy(app.config['db'], branchCode, date)
+            print(f"Slot occupancy rebuilt: {slots} slots")
+            return slots
+    except Exception as e:
+        print(f"Error in rebuild_slot_occupancy: {e}")
@@ -0,0 +1,74 @@
+import base64
+import binascii
+import json
+from flask import request
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(row_id):
+    return base64.urlsafe_b64encode(f"id:{row_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Row id dari cursor; ValueError kalau cursor tidak valid."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        prefix, row_id = raw.split(":", 1)
+        if prefix != "id":
+            raise ValueError
+        return int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("invalid cursor")
+
+
+def page_limit(limit):
+    """Ukuran halaman dari nilai ?limit= (None = default), dibatasi MAX_PAGE_SIZE."""
+    try:
+        limit = int(limit) if limit is not None else DEFAULT_PAGE_SIZE
+    except ValueError:
+        raise ValueError("invalid limit")
+    if limit < 1:
+        raise ValueError("invalid limit")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def encode_keyset(values):
+    """Cursor opaque dari nilai kunci urutan baris terakhir."""
+    return base64.urlsafe_b64encode(json.dumps(values, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_keyset(cursor, size):
+    """List nilai kunci dari cursor encode_keyset; ValueError kalau tidak valid."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("invalid cursor")
+    return values
+
+
+def catalog_page(api, table_name):
+    """
+    Records tabel katalog untuk route tanpa filter.
+
+    Tanpa ?limit= dan ?cursor= seluruh tabel dikembalikan seperti biasa
+    (pagination None). Kalau salah satunya ada, hanya satu halaman yang diambil
+    dari snapshot, urut row id Grist, beserta info pagination:
+    {"limit", "total", "nextCursor"}.
+    """
+    limit = request.args.get("limit")
+    cursor = request.args.get("cursor")
+    if limit is None and cursor is None:
+        return api.records(table_name), None
+
+    limit = page_limit(limit)
+    after = decode_cursor(cursor) if cursor else None
+    data, last_id, total = api.page(table_name, after, limit)
+    return data, {
+        "limit": limit,
+        "total": total,
+        "nextCursor": encode_cursor(last_id) if last_id is not None else None,
+    }
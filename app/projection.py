@@ -0,0 +1,44 @@
+from flask import request
+
+
+def requested_fields():
+    """Daftar field dari query ?fields=a,b,c, atau None kalau tidak diminta."""
+    raw = request.args.get("fields")
+    if not raw:
+        return None
+    fields = [field.strip() for field in raw.split(",") if field.strip()]
+    return fields or None
+
+
+def requested_view_fields(summary_fields):
+    """
+    Field untuk route list: ?fields= kalau ada, atau summary_fields kalau
+    ?view=summary. ?include=a,b menambah field (mis. items) ke keduanya.
+    None = semua field.
+    """
+    fields = requested_fields()
+    if fields is None and request.args.get("view") == "summary":
+        fields = list(summary_fields)
+    include = request.args.get("include")
+    if fields is not None and include:
+        fields += [field.strip() for field in include.split(",") if field.strip() and field.strip() not in fields]
+    return fields
+
+
+def project(items, fields):
+    """Ambil hanya field yang diminta dari setiap item (list of dict)."""
+    if fields is None:
+        return items
+    return [{field: item[field] for field in fields if field in item} for item in items]
+
+
+def mongo_projection(fields, aliases=None):
+    """
+    Projection MongoDB untuk field response yang diminta. aliases memetakan
+    nama field response ke nama field dokumen (mis. reservationId -> _id).
+    _id selalu ikut (default MongoDB).
+    """
+    if fields is None:
+        return None
+    aliases = aliases or {}
+    return {aliases.get(field, field): 1 for field in fields}
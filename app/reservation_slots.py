@@ -0,0 +1,88 @@
+from datetime import datetime
+import pytz
+from flask import current_app
+from pymongo import UpdateOne
+from app.celery_app import celery
+
+
+def local_zone():
+    return pytz.timezone(current_app.config['RESERVATION_TIMEZONE'])
+
+
+def slot_datetime(date, time):
+    """
+    Waktu slot reservasi sebagai datetime UTC (naive, seperti createdAt).
+    date "%Y-%m-%d" dan time "%H:%M" adalah waktu lokal branch; None kalau
+    tidak bisa dibaca.
+    """
+    try:
+        local = datetime.strptime(f"{date} {time}", '%Y-%m-%d %H:%M')
+    except (TypeError, ValueError):
+        return None
+    return local_zone().localize(local).astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def parse_slot_bound(value):
+    """
+    Batas from/to: tanggal (YYYY-MM-DD, tengah malam waktu lokal) atau
+    datetime ISO 8601. Tanpa offset dianggap waktu lokal branch.
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid datetime: {value}")
+    if parsed.tzinfo is None:
+        parsed = local_zone().localize(parsed)
+    return parsed.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def slot_range(args):
+    """Filter slotAt dari ?from= (inklusif) dan ?to= (eksklusif), atau None."""
+    slot_filter = {}
+    if args.get("from"):
+        slot_filter["$gte"] = parse_slot_bound(args["from"])
+    if args.get("to"):
+        slot_filter["$lt"] = parse_slot_bound(args["to"])
+    return slot_filter or None
+
+
+def backfill_slots(db, batch_size=1000):
+    """
+    Isi slotAt untuk reservasi lama, per batch urut _id. Reservasi yang
+    date/time-nya tidak bisa dibaca diberi slotAt None supaya tidak diulang.
+    Kembalikan jumlah dokumen yang diproses.
+    """
+    collection = db.reservation
+    processed = 0
+    last_id = None
+    while True:
+        query = {"slotAt": {"$exists": False}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = list(collection.find(query, {"date": 1, "time": 1}).sort("_id", 1).limit(batch_size))
+        if not batch:
+            break
+        collection.bulk_write([
+            UpdateOne(
+                {"_id": reservation["_id"], "slotAt": {"$exists": False}},
+                {"$set": {"slotAt": slot_datetime(reservation.get("date"), reservation.get("time"))}},
+            )
+            for reservation in batch
+        ], ordered=False)
+        processed += len(batch)
+        last_id = batch[-1]["_id"]
+        print(f"Backfill slotAt: {processed} reservasi diproses")
+    return processed
+
+
+@celery.task
+def backfill_reservation_slots(batch_size=1000):
+    try:
+        app = celery.app
+        if app is None:
+            print("Flask app is not attached to Celery!")
+            return
+        with app.app_context():
+            return backfill_slots(app.config['db'], batch_size)
+    except Exception as e:
+        print(f"Error in backfill_reservation_slots: {e}")
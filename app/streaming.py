@@ -0,0 +1,39 @@
+from flask import request, current_app, stream_with_context
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def wants_stream():
+    """Client minta NDJSON lewat ?format=ndjson atau Accept: application/x-ndjson."""
+    return request.args.get("format") == "ndjson" or request.accept_mimetypes.best == NDJSON_MIMETYPE
+
+
+def stream_ndjson(cursor, format_item, fields=None):
+    """
+    Response NDJSON (satu dokumen JSON per baris) yang dibangun langsung dari
+    cursor MongoDB. Dokumen diambil per batch dan dikirim bertahap, jadi
+    memori tetap konstan berapa pun jumlah datanya.
+    """
+    batch_size = current_app.config['STREAM_BATCH_SIZE']
+    dumps = current_app.json.dumps
+
+    def generate():
+        lines = []
+        try:
+            for doc in cursor.batch_size(batch_size):
+                item = format_item(doc)
+                if fields is not None:
+                    item = {field: item[field] for field in fields if field in item}
+                lines.append(dumps(item))
+                if len(lines) >= batch_size:
+                    yield "\n".join(lines) + "\n"
+                    lines = []
+            if lines:
+                yield "\n".join(lines) + "\n"
+        except Exception as e:
+            # Status sudah terkirim, jadi hanya bisa dicatat
+            print(f"Error streaming NDJSON: {e}")
+        finally:
+            cursor.close()
+
+    return current_app.response_class(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -0,0 +1,31 @@
+import os
+import pytest
+
+# MongoDB tidak dipakai di test Grist; gagal cepat supaya app jalan dengan db None
+os.environ.setdefault("MONGODB_URI", "mongodb://127.0.0.1:1/?serverSelectionTimeoutMS=100")
+os.environ.setdefault("GRIST_SNAPSHOT_PATH", "")
+os.environ.setdefault("GRIST_RETRIES", "0")
+
+from app import reservation_app  # noqa: E402
+from app.config import Config  # noqa: E402
+from tests.fake_grist import FakeGrist  # noqa: E402
+
+
+@pytest.fixture
+def grist():
+    fake = FakeGrist().start()
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture
+def app(grist, monkeypatch):
+    monkeypatch.setattr(Config, "SERVER", grist.url)
+    monkeypatch.setattr(Config, "DOC_ID", grist.doc_id)
+    monkeypatch.setattr(Config, "API_KEY", "test")
+    return reservation_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,198 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+LIST_TYPES = ("RefList", "ChoiceList")
+
+
+class FakeGrist:
+    """
+    Server Grist palsu untuk test, cukup untuk endpoint yang dipakai app:
+    tables/<t>/data (GET/POST), tables/<t>/columns dan sql.
+
+    Data disimpan di SQLite dengan encoding seperti dokumen Grist asli:
+    Bool jadi 0/1 dan RefList/ChoiceList jadi string JSON. /data mengembalikan
+    encoding API (bool, list), sedangkan /sql mengembalikan nilai mentah.
+    """
+
+    def __init__(self, doc_id="doc"):
+        self.doc_id = doc_id
+        self.db = sqlite3.connect(":memory:", check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.lock = threading.Lock()
+        self.types = {}
+        self.requests = []
+        # Endpoint (data, columns, sql) yang dibuat gagal dengan 500
+        self.failing = set()
+        # Endpoint -> detik jeda sebelum membalas (data tetap ditulis), untuk read timeout
+        self.slow = {}
+        self._server = None
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d" % self._server.server_port
+
+    def start(self):
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def add_table(self, table_name, columns, rows=()):
+        """columns: {kolom: tipe Grist}; rows: list dict nilai (encoding API)."""
+        with self.lock:
+            self.db.execute(f'DROP TABLE IF EXISTS "{table_name}"')
+            definition = ", ".join(f'"{column}"' for column in columns)
+            self.db.execute(
+                f'CREATE TABLE "{table_name}" (id INTEGER PRIMARY KEY, manualSort, {definition})'
+            )
+            self.types[table_name] = dict(columns)
+        for row in rows:
+            self.add_row(table_name, row)
+
+    def add_row(self, table_name, values):
+        values = self._encode(table_name, values)
+        columns = list(values)
+        with self.lock:
+            cursor = self.db.execute(
+                f'INSERT INTO "{table_name}" ({", ".join(f"{chr(34)}{c}{chr(34)}" for c in columns)}) '
+                f'VALUES ({", ".join("?" for _ in columns)})',
+                [values[column] for column in columns],
+            )
+            row_id = cursor.lastrowid
+            self.db.execute(f'UPDATE "{table_name}" SET manualSort = ? WHERE id = ?', [row_id, row_id])
+            self.db.commit()
+        return row_id
+
+    def update_row(self, table_name, row_id, values):
+        values = self._encode(table_name, values)
+        assignments = ", ".join(f'"{column}" = ?' for column in values)
+        with self.lock:
+            self.db.execute(
+                f'UPDATE "{table_name}" SET {assignments} WHERE id = ?', list(values.values()) + [row_id]
+            )
+            self.db.commit()
+
+    def delete_row(self, table_name, row_id):
+        with self.lock:
+            self.db.execute(f'DELETE FROM "{table_name}" WHERE id = ?', [row_id])
+            self.db.commit()
+
+    def calls(self, method=None, path=None):
+        """Request yang diterima, difilter method dan potongan path."""
+        return [
+            (m, p) for m, p in self.requests
+            if (method is None or m == method) and (path is None or path in p)
+        ]
+
+    def _encode(self, table_name, values):
+        types = self.types[table_name]
+        encoded = {}
+        for column, value in values.items():
+            column_type = types.get(column, "Any")
+            if column_type == "Bool" and value is not None:
+                value = int(bool(value))
+            elif column_type.startswith(LIST_TYPES) and value is not None:
+                value = json.dumps(value)
+            encoded[column] = value
+        return encoded
+
+    def _decode(self, table_name, column, value):
+        column_type = self.types[table_name].get(column, "Any")
+        if value is None:
+            return None
+        if column_type == "Bool":
+            return bool(value)
+        if column_type.startswith(LIST_TYPES):
+            return json.loads(value)
+        return value
+
+    def _select(self, table_name, filters):
+        where, args = "", []
+        if filters:
+            where = " WHERE " + " AND ".join(
+                f'"{column}" IN ({", ".join("?" for _ in values)})' for column, values in filters.items()
+            )
+            args = [value for values in filters.values() for value in values]
+        with self.lock:
+            rows = self.db.execute(f'SELECT * FROM "{table_name}"{where} ORDER BY id', args).fetchall()
+        return [dict(row) for row in rows]
+
+    def _columns(self, table_name):
+        return ["id", "manualSort"] + list(self.types[table_name])
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, obj, status=200):
+                body = json.dumps(obj).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _route(self):
+                url = urlparse(self.path)
+                fake.requests.append((self.command, self.path))
+                match = re.match(rf"^/api/docs/{fake.doc_id}/(?:tables/([^/]+)/)?(\w+)$", url.path)
+                if not match:
+                    return None, None, url
+                return match.group(1), match.group(2), url
+
+            def do_GET(self):
+                table_name, endpoint, url = self._route()
+                if endpoint in fake.failing:
+                    return self._send({"error": "Grist is down"}, 500)
+                if table_name not in fake.types:
+                    return self._send({"error": "Table not found"}, 404)
+                if endpoint == "columns":
+                    return self._send({"columns": [
+                        {"id": column, "fields": {"type": column_type}}
+                        for column, column_type in fake.types[table_name].items()
+                    ]})
+                if endpoint == "data":
+                    query = parse_qs(url.query)
+                    filters = json.loads(query["filter"][0]) if "filter" in query else None
+                    rows = fake._select(table_name, filters)
+                    return self._send({
+                        column: [fake._decode(table_name, column, row[column]) for row in rows]
+                        for column in fake._columns(table_name)
+                    })
+                return self._send({"error": "Not found"}, 404)
+
+            def do_POST(self):
+                table_name, endpoint, _ = self._route()
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"null")
+                if endpoint in fake.failing:
+                    return self._send({"error": "Grist is down"}, 500)
+                if endpoint == "sql":
+                    with fake.lock:
+                        rows = fake.db.execute(body["sql"], body.get("args", [])).fetchall()
+                    return self._send({"records": [{"fields": dict(row)} for row in rows]})
+                if endpoint == "data" and table_name in fake.types:
+                    count = len(next(iter(body.values()))) if body else 0
+                    try:
+                        ids = [
+                            fake.add_row(table_name, {column: values[index] for column, values in body.items()})
+                            for index in range(count)
+                        ]
+                    except sqlite3.Error as e:
+                        # Kolom tidak dikenal dsb. ditolak seperti Grist
+                        return self._send({"error": str(e)}, 400)
+                    time.sleep(fake.slow.get(endpoint, 0))
+                    return self._send(ids)
+                return self._send({"error": "Not found"}, 404)
+
+        return Handler
@@ -0,0 +1,59 @@
+ITEM_MENU = {"BranchCode": "Text", "Name": "Text", "MenuSoldOut": "Bool"}
+
+
+def filtered_data_calls(grist, table_name):
+    return grist.calls("GET", f"/tables/{table_name}/data?filter=")
+
+
+def test_branch_view_fetches_partition_once(grist, client):
+    grist.add_table("ItemMenu", ITEM_MENU, [
+        {"BranchCode": "B1", "Name": "Nasi", "MenuSoldOut": False},
+        {"BranchCode": "B2", "Name": "Teh", "MenuSoldOut": True},
+    ])
+
+    first = client.get("/item_menu/B1")
+    assert first.status_code == 200
+    assert [item["Name"] for item in first.json["data"]] == ["Nasi"]
+    assert len(filtered_data_calls(grist, "ItemMenu")) == 1
+
+    second = client.get("/item_menu/B1", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+    assert len(filtered_data_calls(grist, "ItemMenu")) == 1
+
+
+def test_unknown_branch_is_negative_cached(grist, client):
+    grist.add_table("ItemMenu", ITEM_MENU, [{"BranchCode": "B1", "Name": "Nasi"}])
+
+    for _ in range(3):
+        assert client.get("/item_menu/ZZ").status_code == 404
+
+    assert len(filtered_data_calls(grist, "ItemMenu")) == 1
+
+
+def test_partitions_are_bounded(grist, app, client):
+    grist.add_table("ItemMenu", ITEM_MENU, [{"BranchCode": "B1", "Name": "Nasi"}])
+    app.api.max_partitions = 10
+
+    for i in range(50):
+        assert client.get(f"/item_menu/X{i}").status_code == 404
+
+    assert len(app.api._partitions) == 10
+    assert len([key for key in app.api._snapshots if not isinstance(key, str)]) == 10
+    assert len(app.api._table_locks) <= 10
+
+    # Snapshot penuh menggantikan semua partisi tabel ini
+    app.api.refresh("ItemMenu")
+    assert not app.api._partitions
+    assert set(app.api._table_locks) <= {"ItemMenu"}
+
+
+def test_evicted_partition_is_not_served_from_response_cache(grist, app, client):
+    grist.add_table("ItemMenu", ITEM_MENU, [{"BranchCode": "B1", "Name": "Nasi"}])
+    app.api.max_partitions = 1
+
+    assert client.get("/item_menu/B1").json["data"][0]["Name"] == "Nasi"
+    client.get("/item_menu/B2")
+    grist.update_row("ItemMenu", 1, {"Name": "Nasi Goreng"})
+
+    # B1 sudah dibuang dari LRU; versi barunya tidak boleh bentrok dengan entri lama
+    assert client.get("/item_menu/B1").json["data"][0]["Name"] == "Nasi Goreng"
@@ -0,0 +1,36 @@
+AREA = {"BranchCode": "Text", "TableAreaID": "Text", "TableAreaName": "Text", "Order": "Int"}
+SECTION = {"BranchCode": "Text", "TableSectionID": "Text", "TableSectionName": "Text", "Order": "Int"}
+TABLES = {"BranchCode": "Text", "TableSectionID": "Text", "TableName": "Text", "Order": "Int"}
+
+
+def test_floor_plan_groups_tables_by_section(grist, client):
+    grist.add_table("Tables_Area", AREA, [
+        {"BranchCode": "B1", "TableAreaID": "A1", "TableAreaName": "Indoor", "Order": 1},
+    ])
+    grist.add_table("TablesSection", SECTION, [
+        {"BranchCode": "B1", "TableSectionID": "S2", "TableSectionName": "Teras", "Order": 2},
+        {"BranchCode": "B1", "TableSectionID": "S1", "TableSectionName": "Lantai 1", "Order": 1},
+        {"BranchCode": "B2", "TableSectionID": "S1", "TableSectionName": "Lain", "Order": 1},
+    ])
+    grist.add_table("Tables", TABLES, [
+        {"BranchCode": "B1", "TableSectionID": "S1", "TableName": "T2", "Order": 2},
+        {"BranchCode": "B1", "TableSectionID": "S1", "TableName": "T1", "Order": 1},
+        {"BranchCode": "B1", "TableSectionID": None, "TableName": "T9", "Order": 9},
+        {"BranchCode": "B2", "TableSectionID": "S1", "TableName": "X1", "Order": 1},
+    ])
+
+    response = client.get("/floor_plan/B1")
+    assert response.status_code == 200
+    data = response.json["data"]
+    assert [area["TableAreaName"] for area in data["areas"]] == ["Indoor"]
+    assert [
+        (section["TableSectionName"], [table["TableName"] for table in section["tables"]])
+        for section in data["sections"]
+    ] == [("Lantai 1", ["T1", "T2"]), ("Teras", [])]
+    assert [table["TableName"] for table in data["unassignedTables"]] == ["T9"]
+
+
+def test_floor_plan_unknown_branch(grist, client):
+    for name, columns in (("Tables_Area", AREA), ("TablesSection", SECTION), ("Tables", TABLES)):
+        grist.add_table(name, columns)
+    assert client.get("/floor_plan/ZZ").status_code == 404
@@ -0,0 +1,30 @@
+from app.grist_batch import add_records_batch, batch_status
+from app.grist_client import PooledGristDocAPI
+
+UPLOADED = {"MenusID": "Text", "url": "Text", "image": "Text"}
+
+
+def make_api(grist):
+    return PooledGristDocAPI(grist.doc_id, api_key="test", server=grist.url, retries=0)
+
+
+def test_batch_rejects_items_without_key_or_url(grist):
+    grist.add_table("ImageItemUploaded", UPLOADED)
+    results = add_records_batch(
+        make_api(grist), "ImageItemUploaded", [{"MenusID": "M1", "url": "u"}, {"image": "i"}], "MenusID"
+    )
+    assert [result["status"] for result in results] == ["created", "error"]
+    assert batch_status(results) == 207
+
+
+def test_single_record_is_written_without_validation(grist, client):
+    grist.add_table("ImageItemUploaded", UPLOADED)
+    results = add_records_batch(
+        make_api(grist), "ImageItemUploaded", [{"MenusID": "M1", "image": "i"}], "MenusID", validate=False
+    )
+    assert results == [{"index": 0, "MenusID": "M1", "status": "created", "id": 1}]
+
+    # Tanpa MongoDB route menulis langsung ke Grist, body apa pun diteruskan
+    response = client.post("/upload_menu_url/M2", json={"image": "j"})
+    assert response.status_code == 201
+    assert len(grist.calls("POST", "/tables/ImageItemUploaded/data")) == 2
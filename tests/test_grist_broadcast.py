@@ -0,0 +1,58 @@
+from app.grist_cache import CachedGristAPI
+from app.grist_client import PooledGristDocAPI
+from app.grist_store import SnapshotStore
+from app.grist_sync import GristSyncEngine
+
+ITEM_MENU = {"BranchCode": "Text", "Name": "Text", "MenuSoldOut": "Bool", "UpdatedAt": "Numeric"}
+
+
+def make_worker(grist, path):
+    """Satu CachedGristAPI seperti di satu proses web worker, store dipakai bersama."""
+    api = PooledGristDocAPI(grist.doc_id, api_key="test", server=grist.url, retries=0)
+    return CachedGristAPI(
+        api, default_ttl=300, sync=GristSyncEngine(api), store=SnapshotStore(path), generation_interval=0
+    )
+
+
+def sold_out(worker):
+    return [item["MenuSoldOut"] for item in worker.records("ItemMenu")]
+
+
+def test_webhook_patch_reaches_other_workers(grist, tmp_path):
+    grist.add_table("ItemMenu", ITEM_MENU, [{"BranchCode": "B1", "Name": "Nasi", "MenuSoldOut": False, "UpdatedAt": 1}])
+    path = str(tmp_path / "snapshot.sqlite3")
+    first, second = make_worker(grist, path), make_worker(grist, path)
+    assert sold_out(first) == sold_out(second) == [False]
+    data_calls = len(grist.calls("GET", "/tables/ItemMenu/data"))
+
+    assert first.patch("ItemMenu", [{"id": 1, "MenuSoldOut": True}])
+
+    assert sold_out(first) == [True]
+    assert sold_out(second) == [True]
+    # Worker lain memuat snapshot hasil patch dari store, bukan dari Grist
+    assert len(grist.calls("GET", "/tables/ItemMenu/data")) == data_calls
+    assert second.stats()["remoteInvalidations"] == 1
+
+
+def test_webhook_invalidate_reaches_other_workers(grist, tmp_path):
+    grist.add_table("ItemMenu", ITEM_MENU, [{"BranchCode": "B1", "Name": "Nasi", "MenuSoldOut": False, "UpdatedAt": 1}])
+    path = str(tmp_path / "snapshot.sqlite3")
+    first, second = make_worker(grist, path), make_worker(grist, path)
+    assert sold_out(first) == sold_out(second) == [False]
+
+    grist.update_row("ItemMenu", 1, {"MenuSoldOut": True, "UpdatedAt": 2})
+    first.invalidate("ItemMenu", [{"id": 1, "MenuSoldOut": True}])
+
+    assert sold_out(second) == [True]
+    assert sold_out(first) == [True]
+
+
+def test_stale_snapshot_served_when_grist_is_down(grist, tmp_path):
+    grist.add_table("ItemMenu", ITEM_MENU, [{"BranchCode": "B1", "Name": "Nasi", "MenuSoldOut": False, "UpdatedAt": 1}])
+    path = str(tmp_path / "snapshot.sqlite3")
+    first, second = make_worker(grist, path), make_worker(grist, path)
+    assert sold_out(second) == [False]
+
+    grist.failing.update({"data", "sql"})
+    first.invalidate("ItemMenu")
+    assert sold_out(second) == [False]
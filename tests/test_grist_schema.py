@@ -0,0 +1,30 @@
+ITEM_MENU = {"BranchCode": "Text", "Name": "Text"}
+
+
+def test_fallback_schema_is_cached_while_columns_fail(grist, app):
+    grist.add_table("ItemMenu", ITEM_MENU, [{"BranchCode": "B1", "Name": "Nasi"}])
+    api = app.api
+    snap = api.snapshot("ItemMenu")
+    grist.failing.add("columns")
+
+    for _ in range(4):
+        assert api.records("ItemMenu", snap)[0]["Name"] == "Nasi"
+
+    assert len(grist.calls("GET", "/tables/ItemMenu/columns")) == 1
+    assert len(snap._records) == 1
+
+
+def test_real_schema_is_loaded_after_retry_window(grist, app):
+    grist.add_table("ItemMenu", ITEM_MENU, [{"BranchCode": "B1", "Name": "Nasi"}])
+    api = app.api
+    api.schemas.retry_after = 0
+    snap = api.snapshot("ItemMenu")
+    grist.failing.add("columns")
+    api.records("ItemMenu", snap)
+
+    grist.failing.clear()
+    api.records("ItemMenu", snap)
+    api.records("ItemMenu", snap)
+
+    assert len(grist.calls("GET", "/tables/ItemMenu/columns")) == 2
+    assert api.schemas.stats() == {"ItemMenu": ["ID", "RowID", "BranchCode", "Name"]}
@@ -0,0 +1,55 @@
+from app.grist_sync import GristSyncEngine
+from app.grist_client import PooledGristDocAPI
+
+ITEM_MENU = {"BranchCode": "Text", "Name": "Text", "MenuSoldOut": "Bool", "Tags": "RefList:Tags", "UpdatedAt": "Numeric"}
+
+
+def make_engine(grist):
+    return GristSyncEngine(PooledGristDocAPI(grist.doc_id, api_key="test", server=grist.url, retries=0))
+
+
+def test_delta_sync_keeps_api_encoding(grist):
+    grist.add_table("ItemMenu", ITEM_MENU, [
+        {"BranchCode": "B1", "Name": "Nasi", "MenuSoldOut": False, "Tags": ["L", 1], "UpdatedAt": 100},
+        {"BranchCode": "B1", "Name": "Teh", "MenuSoldOut": False, "Tags": None, "UpdatedAt": 100},
+    ])
+    engine = make_engine(grist)
+    rows, changed = engine.sync("ItemMenu")
+    assert changed
+
+    grist.update_row("ItemMenu", 1, {"MenuSoldOut": True, "UpdatedAt": 200})
+    rows, changed = engine.sync("ItemMenu", rows)
+
+    assert changed
+    assert engine.delta_syncs == 1 and engine.full_syncs == 1
+    nasi = next(row for row in rows if row.id == 1)
+    assert nasi.MenuSoldOut is True
+    assert nasi.Tags == ["L", 1]
+
+
+def test_delta_sync_without_changes_keeps_rows(grist):
+    grist.add_table("ItemMenu", ITEM_MENU, [
+        {"BranchCode": "B1", "Name": "Nasi", "MenuSoldOut": True, "Tags": ["L", 1, 2], "UpdatedAt": 100},
+    ])
+    engine = make_engine(grist)
+    rows, _ = engine.sync("ItemMenu")
+
+    # Baris dengan UpdatedAt == mark ikut terambil lagi, tapi tidak dianggap berubah
+    new_rows, changed = engine.sync("ItemMenu", rows)
+    assert not changed
+    assert new_rows is rows
+
+
+def test_delta_sync_drops_deleted_rows_on_reconcile(grist):
+    grist.add_table("ItemMenu", ITEM_MENU, [
+        {"BranchCode": "B1", "Name": "Nasi", "UpdatedAt": 100},
+        {"BranchCode": "B1", "Name": "Teh", "UpdatedAt": 100},
+    ])
+    engine = make_engine(grist)
+    engine.reconcile_interval = 0
+    rows, _ = engine.sync("ItemMenu")
+
+    grist.delete_row("ItemMenu", 2)
+    rows, changed = engine.sync("ItemMenu", rows)
+    assert changed
+    assert [row.id for row in rows] == [1]
@@ -0,0 +1,81 @@
+from datetime import datetime
+import pytest
+import app.grist_writer as grist_writer
+
+mongomock = pytest.importorskip("mongomock")
+
+UPLOADED = {"MenusID": "Text", "url": "Text", "image": "Text"}
+
+
+@pytest.fixture
+def queue(grist, app, monkeypatch):
+    grist.add_table("ImageItemUploaded", UPLOADED)
+    app.config["db"] = mongomock.MongoClient().reservation
+    scheduled = []
+    monkeypatch.setattr(grist_writer.flush_grist_writes, "apply_async", lambda countdown=None: scheduled.append(countdown))
+    return scheduled
+
+
+def job(app, job_id):
+    from bson import ObjectId
+    return app.config["db"].grist_write_jobs.find_one({"_id": ObjectId(job_id)})
+
+
+def make_due(app):
+    app.config["db"].grist_write_jobs.update_many({}, {"$set": {"nextAttemptAt": datetime.utcnow()}})
+
+
+def uploaded_rows(grist):
+    return grist._select("ImageItemUploaded", None)
+
+
+def test_single_record_is_queued_and_flushed(grist, app, client, queue):
+    response = client.post("/upload_menu_url/M1", json={"image": "i"})
+    assert response.status_code == 202
+    job_id = response.json["data"]["jobId"]
+
+    assert grist_writer.flush_grist_writes() == {"jobs": 1, "retryIn": None}
+    assert job(app, job_id)["status"] == "done"
+    assert [row["MenusID"] for row in uploaded_rows(grist)] == ["M1"]
+
+    status = client.get(f"/grist_write/{job_id}").json["data"]
+    assert status["items"][0]["status"] == "created"
+
+
+def test_server_error_is_retried(grist, app, client, queue):
+    job_id = client.post("/upload_menu_url", json=[{"MenusID": "M1", "url": "u"}]).json["data"]["jobId"]
+    grist.failing.add("data")
+
+    assert grist_writer.flush_grist_writes()["retryIn"] == 2
+    assert job(app, job_id)["status"] == "queued"
+    assert job(app, job_id)["items"][0]["status"] == "error"
+
+    grist.failing.clear()
+    make_due(app)
+    grist_writer.flush_grist_writes()
+    assert job(app, job_id)["status"] == "done"
+    assert len(uploaded_rows(grist)) == 1
+
+
+def test_read_timeout_is_not_retried(grist, app, client, queue):
+    job_id = client.post("/upload_menu_url", json=[{"MenusID": "M1", "url": "u"}]).json["data"]["jobId"]
+    grist.slow["data"] = 0.5
+    app.api._api.timeout = (1, 0.1)
+
+    assert grist_writer.flush_grist_writes()["retryIn"] is None
+    assert job(app, job_id)["status"] == "review"
+    assert job(app, job_id)["items"][0]["status"] == "unknown"
+
+    # Baris mungkin sudah tersimpan: flush berikutnya tidak menulis ulang
+    make_due(app)
+    grist_writer.flush_grist_writes()
+    assert len(uploaded_rows(grist)) == 1
+
+
+def test_rejected_write_fails_without_retry(grist, app, client, queue):
+    job_id = client.post("/upload_menu_url/M1", json={"unknownColumn": "x"}).json["data"]["jobId"]
+
+    assert grist_writer.flush_grist_writes()["retryIn"] is None
+    assert job(app, job_id)["status"] == "failed"
+    assert job(app, job_id)["items"][0]["status"] == "failed"
+    assert queue == [2]
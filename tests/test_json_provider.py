@@ -0,0 +1,27 @@
+from collections import namedtuple
+from datetime import datetime
+from bson import ObjectId
+from app.json_provider import encode_value
+
+BRANCH = {"BranchCode": "Text", "BranchName": "Text", "IsActive": "Bool"}
+TABLES = {"BranchCode": "Text", "TableName": "Text", "Seats": "Int"}
+
+
+def test_encode_value():
+    Row = namedtuple("Row", ["id", "Name"])
+    assert encode_value(Row(1, "Nasi")) == [1, "Nasi"]
+    assert encode_value(ObjectId("0123456789abcdef01234567")) == "0123456789abcdef01234567"
+    assert encode_value(datetime(2025, 1, 1, 11, 0)) == "2025-01-01T11:00:00Z"
+
+
+def test_raw_rows_are_returned_as_arrays(grist, client):
+    grist.add_table("Branch", BRANCH, [{"BranchCode": "B1", "BranchName": "Pusat", "IsActive": True}])
+    grist.add_table("Tables", TABLES, [{"BranchCode": "B1", "TableName": "T1", "Seats": 4}])
+
+    branch = client.get("/branch")
+    assert branch.status_code == 200
+    assert branch.json["data"] == [[1, 1, "B1", "Pusat", True]]
+
+    tables = client.get("/table")
+    assert tables.status_code == 200
+    assert tables.json["data"] == [[1, 1, "B1", "T1", 4]]
@@ -0,0 +1,12 @@
+from app.config import Config
+from app.mongo_indexes import INDEXES, QUERIES
+
+
+def test_warm_runs_expire_by_ttl():
+    (name, keys, options), = INDEXES["catalog_warm_runs"]
+    assert keys == [("startedAt", 1)]
+    assert options == {"expireAfterSeconds": Config.CATALOG_WARM_RUNS_TTL}
+
+
+def test_queries_refer_to_registered_collections():
+    assert {collection for collection, _, _ in QUERIES} <= set(INDEXES)
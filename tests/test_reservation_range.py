@@ -0,0 +1,48 @@
+from datetime import datetime
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+
+@pytest.fixture
+def reservations(app):
+    db = mongomock.MongoClient().reservation
+    app.config["db"] = db
+    db.reservation.insert_many([
+        # Belum di-backfill: belum punya slotAt
+        {"branchCode": "B1", "date": "2026-01-01", "time": "19:00", "status": "paid"},
+        {"branchCode": "B1", "date": "2026-01-02", "time": "12:00", "status": "paid",
+         "slotAt": datetime(2026, 1, 2, 5, 0)},
+        {"branchCode": "B1", "date": "2026-01-02", "time": "18:00", "status": "paid",
+         "slotAt": datetime(2026, 1, 2, 11, 0)},
+        {"branchCode": "B1", "date": "2026-01-03", "time": "12:00", "status": "paid",
+         "slotAt": datetime(2026, 1, 3, 5, 0)},
+    ])
+    return db
+
+
+def times(response):
+    return [(item["date"], item["time"]) for item in response.json["data"]]
+
+
+def test_date_range_keeps_reservations_without_slot(client, reservations):
+    response = client.get("/reservation_branch/B1?dateFrom=2026-01-01&dateTo=2026-01-02")
+    assert response.status_code == 200
+    assert sorted(times(response)) == [("2026-01-01", "19:00"), ("2026-01-02", "12:00"), ("2026-01-02", "18:00")]
+
+
+def test_slot_range_pages_by_slot(client, reservations):
+    url = "/reservation_branch/B1?from=2026-01-02T00:00:00Z&to=2026-01-04T00:00:00Z&limit=2"
+    first = client.get(url)
+    assert first.status_code == 200
+    assert times(first) == [("2026-01-02", "12:00"), ("2026-01-02", "18:00")]
+
+    cursor = first.json["pagination"]["nextCursor"]
+    second = client.get(url + "&after=" + cursor)
+    assert times(second) == [("2026-01-03", "12:00")]
+    assert second.json["pagination"]["nextCursor"] is None
+
+
+def test_mixed_ranges_are_rejected(client, reservations):
+    response = client.get("/reservation_branch/B1?from=2026-01-02T00:00:00Z&dateTo=2026-01-02")
+    assert response.status_code == 400
@@ -0,0 +1,30 @@
+import pytest
+
+ITEM_MENU = {"BranchCode": "Text", "Name": "Text"}
+
+
+@pytest.fixture
+def webhook_client(app):
+    app.config["GRIST_WEBHOOK_SECRET"] = "secret"
+    return app.test_client()
+
+
+@pytest.mark.parametrize("payload", ['"x"', "1", "{}", '{"records": "x"}', '["x"]', '[{"fields": 1}]'])
+def test_webhook_rejects_invalid_payload(webhook_client, payload):
+    response = webhook_client.post(
+        "/grist_webhook/ItemMenu?token=secret", data=payload, content_type="application/json"
+    )
+    assert response.status_code == 400
+
+
+def test_webhook_patches_snapshot(grist, webhook_client):
+    grist.add_table("ItemMenu", ITEM_MENU, [{"BranchCode": "B1", "Name": "Nasi"}])
+    assert webhook_client.get("/item_menu").status_code == 200
+
+    response = webhook_client.post(
+        "/grist_webhook/ItemMenu?token=secret",
+        json={"records": [{"id": 1, "fields": {"BranchCode": "B1", "Name": "Nasi Goreng"}}]},
+    )
+    assert response.status_code == 200
+    assert response.json["data"]["action"] == "patched"
+    assert webhook_client.get("/item_menu").json["data"][0]["Name"] == "Nasi Goreng"